@@ -1,4 +1,5 @@
 """Tests for cache control plugin functionality."""
+import os
 import pytest
 from unittest.mock import patch, MagicMock
 from pathlib import Path
@@ -79,3 +80,68 @@ def test_cache_list():
     # Test multiple reads return consistent results
     result2 = plugin.generate("/.touchfs/cache_list", node, fs_structure)
     assert result == result2  # Second read should match first read exactly
+
+def test_cache_files_are_listed_sized_and_cleared(tmp_path, monkeypatch):
+    """Test cache_list, cache_stats and cache_clear against a cache folder."""
+    from touchfs.core import cache
+    monkeypatch.setenv("TOUCHFS_CACHE_FOLDER", str(tmp_path))
+    monkeypatch.setattr(cache, "get_cache_enabled", lambda: True)
+    for name in ["a", "b"]:
+        cache.cache_response({"type": "file_content", "path": f"/{name}.py", "model": "m"}, "x" * 10)
+    (tmp_path / "notes.txt").write_text("not a cache file")
+
+    plugin = CacheControlPlugin()
+    node = create_file_node()
+    listing = plugin.generate("/.touchfs/cache_list", node, {})
+    assert "file:/a.py" in listing and "file:/b.py" in listing
+    size = sum(p.stat().st_size for p in tmp_path.glob("*.json"))
+    assert f"Size: {size} bytes" in plugin.generate("/.touchfs/cache_stats", node, {})
+
+    node.content = "1"
+    plugin.generate("/.touchfs/cache_clear", node, {})
+    assert [p.name for p in tmp_path.iterdir()] == ["notes.txt"]
+    assert plugin.generate("/.touchfs/cache_list", create_file_node(), {}) == "Cache empty\n"
+
+def test_cache_scans_are_reused_until_the_cache_changes(tmp_path, monkeypatch):
+    """Test that repeated cache_stats reads reuse one scan until an entry is added."""
+    from touchfs.core import cache
+    monkeypatch.setenv("TOUCHFS_CACHE_FOLDER", str(tmp_path))
+    monkeypatch.setattr(cache, "get_cache_enabled", lambda: True)
+    plugin = CacheControlPlugin()
+    scans = []
+    scan = plugin._scan_cache_size
+    monkeypatch.setattr(plugin, "_scan_cache_size", lambda: scans.append(1) or scan())
+
+    plugin.generate("/.touchfs/cache_stats", create_file_node(), {})
+    plugin.generate("/.touchfs/cache_stats", create_file_node(), {})
+    assert len(scans) == 1
+
+    cache.cache_response({"type": "file_content", "path": "/a.py"}, "x")
+    os.utime(tmp_path, ns=(0, 0))  # Coarse mtimes could otherwise hide the change
+    size = sum(p.stat().st_size for p in tmp_path.glob("*.json"))
+    assert f"Size: {size} bytes" in plugin.generate("/.touchfs/cache_stats", create_file_node(), {})
+    assert len(scans) == 2
+
+def test_cache_list_uses_stored_summaries(tmp_path, monkeypatch):
+    """Test that cache_list shows summaries stored at write time without reading entries."""
+    import json
+    from touchfs.core import cache
+    from touchfs.content.plugins import cache_control
+    monkeypatch.setenv("TOUCHFS_CACHE_FOLDER", str(tmp_path))
+    monkeypatch.setattr(cache, "get_cache_enabled", lambda: True)
+    cache.cache_response({"type": "file_content", "path": "/a.py", "model": "m"}, "x" * 10)
+    cache.cache_response({"type": "file_content", "path": "/b.py", "model": "m"}, "y" * 10)
+    next(tmp_path.glob("*.json")).with_suffix(".meta").unlink()  # One entry falls back to parsing
+    fs_response = {"data": {"/c.py": {"type": "file", "attrs": {"st_mode": "33188"}}}}
+    cache.cache_response({"type": "filesystem", "prompt": "p", "model": "m"}, fs_response)
+
+    parsed = CacheControlPlugin().generate("/.touchfs/cache_list", create_file_node(), {})
+    with patch.object(cache_control, "_read_cache_file", side_effect=AssertionError):
+        monkeypatch.setattr(cache_control, "_read_cache_summary",
+                            lambda path: cache.summarize_cache_entry({"type": "file_content", "path": "/s.py"}, 1))
+        summarized = CacheControlPlugin().generate("/.touchfs/cache_list", create_file_node(), {})
+    assert "file:/a.py" in parsed and "file:/b.py" in parsed
+    # Responses are measured as encoded JSON, like the stored summaries do
+    assert parsed.count("resp:12") == 2 and "<error>" not in parsed
+    assert f"resp:{len(json.dumps(fs_response))}" in parsed
+    assert summarized.count("file:/s.py") == 3
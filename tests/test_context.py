@@ -202,3 +202,43 @@ def test_include_patterns(tmp_path):
     assert any("test.py" in entry for entry in file_entries), "Python file should be included"
     assert any("test.js" in entry for entry in file_entries), "JavaScript file should be included"
     assert not any("test.txt" in entry for entry in file_entries), "Text file should not be included"
+
+def test_compiled_patterns_match_path_semantics():
+    """Test compiled exclude/include patterns agree with Path.match."""
+    from touchfs.core.context.context import _compile_path_patterns
+    patterns = ['*.pyc', '*/__pycache__', '*.git*', 'src/*.py', '[!a]*.md', '/tmp/x/*.py']
+    paths = ['/r/a.pyc', '/r/__pycache__', '/r/.gitignore', 'src/m.py', 'lib/src/m.py',
+             'src/sub/m.py', 'a.md', 'b.md', '/tmp/x/m.py', '/tmp/y/m.py']
+    
+    for pattern in patterns:
+        compiled = _compile_path_patterns([pattern])
+        for path in paths:
+            assert bool(compiled.search(path)) == Path(path).match(pattern), f"{pattern} vs {path}"
+    
+    assert _compile_path_patterns([]) is None
+
+def test_excluded_directories_are_pruned(tmp_path):
+    """Test excluded directories are skipped together with their subdirectories."""
+    (tmp_path / "keep.py").write_text("keep")
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "index.js").write_text("vendored")
+    (tmp_path / "__pycache__" / "nested").mkdir(parents=True)
+    (tmp_path / "__pycache__" / "nested" / "cache.py").write_text("cache")
+    
+    context = build_context(str(tmp_path), exclude_patterns=["node_modules", "*/__pycache__/*"])
+    file_entries = [line[8:] for line in context.split('\n') if line.startswith('# File: ')]
+    
+    assert file_entries == ["keep.py"]
+
+def test_file_patterns_do_not_prune_directories(tmp_path):
+    """Test that the default '*.git*' pattern skips .git but keeps .github files."""
+    (tmp_path / ".github" / "workflows").mkdir(parents=True)
+    (tmp_path / ".github" / "workflows" / "ci.yml").write_text("name: ci")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "info.txt").write_text("git internals")
+    (tmp_path / ".gitignore.txt").write_text("ignored")
+    
+    context = build_context(str(tmp_path))
+    file_entries = [line[8:] for line in context.split('\n') if line.startswith('# File: ')]
+    
+    assert file_entries == [".github/workflows/ci.yml"]
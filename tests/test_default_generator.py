@@ -231,3 +231,9 @@ def test_empty_files(mock_get_client, caplog):
         response_format=GeneratedContent,
         temperature=0.2
     )
+
+def test_prompt_segments_substitute_context():
+    """Test that joining the prompt segments matches substituting {CONTEXT}."""
+    from touchfs.content.plugins.default import _prompt_segments
+    for prompt in ["Use this: {CONTEXT}", "{CONTEXT} then {CONTEXT}", "No placeholder"]:
+        assert "ctx".join(_prompt_segments(prompt)) == prompt.replace("{CONTEXT}", "ctx")
@@ -280,6 +280,65 @@ def test_generate_multiple_with_parents(temp_dir, mock_openai, capsys):
         content = file.read_text()
         assert content == "Test generated content"
 
+def test_generate_in_parallel_reports_in_order(temp_dir, mock_openai, capsys, monkeypatch):
+    """Test that files sharing a new parent are generated in parallel and reported in order."""
+    monkeypatch.setenv("TOUCHFS_GENERATE_WORKERS", "4")
+    test_files = [temp_dir / "shared" / f"file{i}.txt" for i in range(6)]
+    
+    from touchfs.cli.generate_command import generate_main
+    result = generate_main(
+        files=[str(f) for f in test_files],
+        parents=True,
+        force=True
+    )
+    
+    assert result == 0
+    for file in test_files:
+        assert file.read_text() == "Test generated content"
+    
+    generated = [line.split(":")[0] for line in capsys.readouterr().out.splitlines()
+                 if line.startswith("Generated ")]
+    assert generated == [f"Generated {f}" for f in test_files]
+
+def test_generate_batch_uses_single_request(temp_dir, mock_openai, monkeypatch):
+    """Test that --batch generates all new files with one request and no per-file calls."""
+    monkeypatch.setenv("TOUCHFS_CACHE_FOLDER", str(temp_dir / "cache"))
+    test_files = [temp_dir / f"batch{i}.txt" for i in range(3)]
+    client = mock_openai.return_value
+    batch_response = MagicMock()
+    batch_response.choices[0].message.content = json.dumps(
+        {str(f): f"content of {f.name}" for f in test_files})
+    client.chat.completions.create.return_value = batch_response
+    
+    from touchfs.cli.generate_command import generate_main
+    result = generate_main(
+        files=[str(f) for f in test_files],
+        force=True,
+        batch=True
+    )
+    
+    assert result == 0
+    for file in test_files:
+        assert file.read_text() == f"content of {file.name}"
+    assert client.chat.completions.create.call_count == 1
+    client.beta.chat.completions.parse.assert_not_called()
+
+def test_generate_batch_warns_without_cache(temp_dir, mock_openai, monkeypatch, capsys):
+    """Test that --batch says it was skipped when the cache is disabled."""
+    monkeypatch.setattr("touchfs.cli.generate.cli.get_cache_enabled", lambda: False)
+    test_files = [temp_dir / f"batch{i}.txt" for i in range(2)]
+    
+    from touchfs.cli.generate_command import generate_main
+    result = generate_main(
+        files=[str(f) for f in test_files],
+        force=True,
+        batch=True
+    )
+    
+    assert result == 0
+    assert "--batch needs the cache enabled" in capsys.readouterr().err
+    mock_openai.return_value.chat.completions.create.assert_not_called()
+
 def test_generate_with_context(temp_dir, mock_openai):
     """Test content generation uses context from surrounding files."""
     # Create a context file
@@ -353,3 +412,16 @@ def test_debug_logging(temp_dir, mock_openai):
     assert test_file.exists()
     content = test_file.read_text()
     assert content == "Test generated content"
+
+def test_filesystem_list_keeps_logging_configuration():
+    """Test that generating a file list leaves the command's log handlers in place."""
+    from touchfs.config.logger import setup_logging
+    from touchfs.content.filesystem_generator import generate_filesystem_list
+    logger = setup_logging(command_name="generate", debug_stdout=True)
+    handlers = list(logger.handlers)
+
+    client = MagicMock()
+    client.beta.chat.completions.parse.return_value = MockFilesystemResponse(["a.py"])
+    result = generate_filesystem_list("A project", client=client)
+    assert result.files == ["a.py"]
+    assert logger.handlers == handlers
@@ -14,7 +14,7 @@ def test_cache_initialization(tmp_path):
 def test_generator_caching():
     """Test that content generation properly uses caching."""
     # Mock OpenAI client
-    with patch('touchfs.content.generator.OpenAI') as mock:
+    with patch('touchfs.content.client.OpenAI') as mock:
         mock_client = MagicMock()
         mock.return_value = mock_client
 
@@ -138,6 +138,9 @@ def test_context_filtering(tmp_path, monkeypatch):
         assert "/test.txt" in fs_nodes
         assert "/script.py" in fs_nodes
         assert "/image.jpg" not in fs_nodes
+        # Nodes are handed to plugins as FileNode models
+        assert isinstance(fs_nodes["/script.py"], FileNode)
+        assert fs_nodes["/script.py"].content == "print('hello')"
         return "generated content"
         
     mock_generator.generate = mock_generate
@@ -190,3 +193,319 @@ def test_cache_invalidation(tmp_path, monkeypatch):
     # Third generation should miss cache due to different prompt
     generate_file_content(test_file, structure.copy())
     assert mock_generator.generate.call_count == 2  # Increments due to cache miss
+
+def test_filesystem_cache_hit_skips_client(tmp_path, monkeypatch):
+    """Test that a cached filesystem is returned without creating an OpenAI client."""
+    from touchfs.content.generator import generate_filesystem
+    monkeypatch.setenv("TOUCHFS_CACHE_FOLDER", str(tmp_path))
+    monkeypatch.setattr('touchfs.content.generator.get_cache_enabled', lambda: True)
+    
+    fs_data = {"data": {"/": {"type": "directory", "children": {}, "attrs": {"st_mode": "16877"}}}}
+    completion = MagicMock()
+    completion.choices[0].message.content = '{"data": {"/": {"type": "directory", "children": {}, "attrs": {"st_mode": "16877"}}}}'
+    
+    with patch('touchfs.content.generator.get_openai_client') as mock_client:
+        mock_client.return_value.chat.completions.create.return_value = completion
+        assert generate_filesystem("cached project") == fs_data
+        assert mock_client.call_count == 1
+        
+        # Second call is served from cache without building a client
+        assert generate_filesystem("cached project") == fs_data
+        assert mock_client.call_count == 1
+
+def test_content_cache_hit_skips_client(tmp_path, monkeypatch):
+    """Test that cached direct content is returned without creating an OpenAI client."""
+    from touchfs.content.generator import generate_content
+    monkeypatch.setenv("TOUCHFS_CACHE_FOLDER", str(tmp_path))
+    monkeypatch.setattr('touchfs.content.generator.get_cache_enabled', lambda: True)
+    monkeypatch.setattr('touchfs.core.cache.get_cache_enabled', lambda: True)
+    completion = MagicMock()
+    completion.choices[0].message.parsed.content = "cached text"
+    
+    with patch('touchfs.content.generator.get_openai_client') as mock_client:
+        mock_client.return_value.beta.chat.completions.parse.return_value = completion
+        assert generate_content("/tmp/notes.txt", "ctx") == "cached text"
+        assert mock_client.call_count == 1
+        
+        # Without an API key only the cache can answer, and it does
+        mock_client.side_effect = ValueError("OPENAI_API_KEY environment variable is required")
+        assert generate_content("/tmp/notes.txt", "ctx") == "cached text"
+
+def test_proc_file_skips_context_conversion():
+    """Test that proc files only receive their own node unless their plugin needs full context."""
+    mock_generator = MagicMock()
+    mock_generator.needs_full_context = False
+    mock_generator.generate.return_value = "stats"
+    mock_plugin_registry = MagicMock()
+    mock_plugin_registry.get_generator.return_value = mock_generator
+
+    structure = {
+        "_plugin_registry": mock_plugin_registry,
+        "/": {
+            "type": "directory",
+            "attrs": {"st_mode": "16877"},
+            "children": {"notes.txt": "/notes.txt"}
+        },
+        "/notes.txt": {
+            "type": "file",
+            "content": "context",
+            "attrs": {"st_mode": "33188"}
+        },
+        "/.touchfs/cache_stats": {
+            "type": "file",
+            "attrs": {"st_mode": "33188"},
+            "xattrs": {"generator": "cache_control"}
+        }
+    }
+
+    assert generate_file_content("/.touchfs/cache_stats", structure) == "stats"
+    _, _, fs_nodes = mock_generator.generate.call_args[0]
+    assert list(fs_nodes) == ["/.touchfs/cache_stats"]
+    mock_plugin_registry.base.get_underlying_content.assert_not_called()
+
+    # Plugins that walk the tree still get the whole structure
+    mock_generator.needs_full_context = True
+    generate_file_content("/.touchfs/cache_stats", structure)
+    _, _, fs_nodes = mock_generator.generate.call_args[0]
+    assert "/notes.txt" in fs_nodes
+
+def test_cache_filename_is_stable():
+    """Test that cache filenames don't change, so existing cache entries stay valid."""
+    from touchfs.core.cache import compute_cache_filename
+    request_data = {
+        "type": "file_content",
+        "path": "/a.py",
+        "model": "gpt-4o",
+        "prompt": "p",
+        "file_type": "file"
+    }
+    assert compute_cache_filename(request_data) == ("35e98a50", "eyJmaWxlX3R5cGUiOiAiZmlsZSIsICJtb2RlbCI6")
+    # Short requests are padded to the full 40 characters
+    assert compute_cache_filename({"a": 1})[1] == "eyJhIjogMX0=----------------------------"
+
+def test_concurrent_identical_requests_generate_once(tmp_path, monkeypatch):
+    """Test that parallel generations of the same file share one generator call."""
+    import threading
+    import time
+    monkeypatch.setenv("TOUCHFS_CACHE_FOLDER", str(tmp_path))
+    monkeypatch.setattr('touchfs.content.generator.get_cache_enabled', lambda: True)
+
+    structure = {
+        "/": {
+            "type": "directory",
+            "attrs": {"st_mode": "16877"},
+            "children": {"test.txt": "/test.txt"}
+        },
+        "/test.txt": {
+            "type": "file",
+            "attrs": {"st_mode": "33188"},
+            "xattrs": {"touchfs.generate_content": "true"}
+        }
+    }
+
+    calls = []
+    def slow_generate(path, node, fs_nodes):
+        calls.append(path)
+        time.sleep(0.2)
+        return "test content"
+
+    mock_generator = MagicMock()
+    mock_generator.get_prompt.return_value = "concurrent prompt"
+    mock_generator.generate = slow_generate
+    mock_plugin_registry = MagicMock()
+    mock_plugin_registry.get_generator.return_value = mock_generator
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(
+            generate_file_content("/test.txt", structure, registry=mock_plugin_registry)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["test content"] * 4
+    assert len(calls) == 1
+
+def test_file_node_conversion_is_reused_until_node_changes(monkeypatch):
+    """Test that unchanged nodes reuse their FileNode across generations."""
+    from touchfs.content import generator as generator_module
+    from touchfs.content.generator import _to_file_node, forget_file_node
+    monkeypatch.setattr(generator_module, "_file_node_cache", generator_module.OrderedDict())
+    raw = {"type": "file", "content": "one", "attrs": {"st_mode": "33188", "st_size": "3"}}
+
+    node = _to_file_node("/a.txt", raw)
+    assert _to_file_node("/a.txt", raw) is node
+    # A copy of an unchanged node still matches the cached model
+    assert _to_file_node("/a.txt", dict(raw)) is node
+
+    raw["content"] = "two"
+    changed = _to_file_node("/a.txt", raw)
+    assert changed is not node
+    assert changed.content == "two"
+
+    raw["attrs"]["st_mode"] = "33261"
+    assert _to_file_node("/a.txt", raw).attrs.st_mode == "33261"
+
+    # Nodes with the same mode and owner share their attributes
+    other = {"type": "file", "content": "", "attrs": {"st_mode": "33261", "st_size": "0"}}
+    assert _to_file_node("/b.txt", other).attrs is _to_file_node("/a.txt", raw).attrs
+
+    # Removed nodes are dropped, and the least recently used entries go first
+    forget_file_node("/b.txt")
+    assert "/b.txt" not in generator_module._file_node_cache
+    monkeypatch.setattr(generator_module, "_FILE_NODE_CACHE_SIZE", 2)
+    _to_file_node("/b.txt", other)
+    _to_file_node("/a.txt", raw)
+    _to_file_node("/c.txt", other)
+    assert list(generator_module._file_node_cache) == ["/a.txt", "/c.txt"]
+
+def test_request_lock_key_is_reused_for_lookup_and_store(tmp_path, monkeypatch):
+    """Test that the key yielded by request_lock serves both cache lookup and store."""
+    from touchfs.core import cache
+    monkeypatch.setenv("TOUCHFS_CACHE_FOLDER", str(tmp_path))
+    request_data = {"type": "file_content", "path": "/a.txt", "prompt": "p"}
+
+    with cache.request_lock(request_data) as cache_key:
+        assert cache_key == cache.compute_cache_filename(request_data)
+        with patch.object(cache, "compute_cache_filename", side_effect=AssertionError):
+            assert cache.get_cached_response(request_data, cache_key) is None
+            cache.cache_response(request_data, "hello", cache_key)
+            assert cache.get_cached_response(request_data, cache_key) == "hello"
+
+def test_cache_write_replaces_entry_atomically(tmp_path, monkeypatch):
+    """Test that cache entries are renamed into place without leaving temporary files."""
+    from touchfs.core import cache
+    monkeypatch.setenv("TOUCHFS_CACHE_FOLDER", str(tmp_path))
+    monkeypatch.setattr(cache, "get_cache_enabled", lambda: True)
+    request_data = {"type": "file_content", "path": "/a.txt", "prompt": "p"}
+
+    cache.cache_response(request_data, "first")
+    cache.cache_response(request_data, "second")
+    assert sorted(p.suffix for p in tmp_path.iterdir()) == [".json", ".meta"]
+    assert cache.get_cached_response(request_data) == "second"
+
+    with patch.object(cache.os, "replace", side_effect=OSError("disk full")):
+        cache.cache_response(request_data, "third")
+    assert sorted(p.suffix for p in tmp_path.iterdir()) == [".json", ".meta"]
+    assert cache.get_cached_response(request_data) == "second"
+
+def test_generator_and_prompt_are_resolved_once(tmp_path, monkeypatch):
+    """Test that a generation looks up its plugin and prompt only once."""
+    monkeypatch.setenv("TOUCHFS_CACHE_FOLDER", str(tmp_path))
+    monkeypatch.setattr('touchfs.content.generator.get_cache_enabled', lambda: True)
+    mock_generator = MagicMock()
+    mock_generator.get_prompt.return_value = "single lookup prompt"
+    mock_generator.generate.return_value = "content"
+    mock_plugin_registry = MagicMock()
+    mock_plugin_registry.get_generator.return_value = mock_generator
+    structure = {
+        "/": {"type": "directory", "attrs": {"st_mode": "16877"}, "children": {"a.txt": "/a.txt"}},
+        "/a.txt": {"type": "file", "attrs": {"st_mode": "33188"}}
+    }
+
+    assert generate_file_content("/a.txt", structure, registry=mock_plugin_registry) == "content"
+    assert mock_plugin_registry.get_generator.call_count == 1
+    assert mock_generator.get_prompt.call_count == 1
+
+def test_cache_hit_does_not_walk_the_context(tmp_path, monkeypatch):
+    """Test that a cache hit answers the prompt lookup without selecting the whole context."""
+    monkeypatch.setenv("TOUCHFS_CACHE_FOLDER", str(tmp_path))
+    monkeypatch.setattr('touchfs.content.generator.get_cache_enabled', lambda: True)
+    views = []
+    def get_prompt(path, node, fs_nodes):
+        views.append(fs_nodes)
+        return fs_nodes["/.prompt"].content if "/.prompt" in fs_nodes else "global"
+    mock_generator = MagicMock()
+    mock_generator.get_prompt.side_effect = get_prompt
+    mock_generator.generate.side_effect = lambda path, node, fs_nodes: ",".join(sorted(fs_nodes))
+    mock_plugin_registry = MagicMock()
+    mock_plugin_registry.base.overlay_path = None
+    mock_plugin_registry.get_generator.return_value = mock_generator
+    structure = {
+        "/": {"type": "directory", "attrs": {"st_mode": "16877"},
+              "children": {"a.txt": "/a.txt", "b.md": "/b.md", ".touchfs": "/.touchfs"}},
+        "/a.txt": {"type": "file", "attrs": {"st_mode": "33188"}},
+        "/b.md": {"type": "file", "content": "notes", "attrs": {"st_mode": "33188"}},
+        "/.touchfs": {"type": "directory", "attrs": {"st_mode": "16877"}, "children": {}}
+    }
+
+    first = generate_file_content("/a.txt", structure, registry=mock_plugin_registry)
+    assert first == "/,/a.txt,/b.md"
+    assert generate_file_content("/a.txt", structure, registry=mock_plugin_registry) == first
+    assert mock_generator.generate.call_count == 1
+    assert views[-1]._raw is None
+
+def test_image_cache_key_matches_image_plugin_hash():
+    """Test that the image cache key hashes the context like the image plugin does."""
+    from touchfs.content.generator import _LazyFsNodes, _file_content_request_data, _to_file_node
+    from touchfs.content.plugins.image.cache import calculate_filesystem_hash
+    mock_plugin_registry = MagicMock()
+    mock_plugin_registry.base.overlay_path = None
+    structure = {
+        "/": {"type": "directory", "attrs": {"st_mode": "16877"},
+              "children": {"a.txt": "/a.txt", "cat.png": "/cat.png"}},
+        "/a.txt": {"type": "file", "content": "a cat", "attrs": {"st_mode": "33188"}},
+        "/cat.png": {"type": "file", "attrs": {"st_mode": "33188"}}
+    }
+    fs_nodes = _LazyFsNodes(structure, False, mock_plugin_registry)
+    node = _to_file_node("/cat.png", structure["/cat.png"])
+
+    from touchfs.models.cache_keys import ImageCacheKey
+    request_data = _file_content_request_data("/cat.png", node, fs_nodes, MagicMock())
+    plugin_hash = calculate_filesystem_hash(dict(fs_nodes.items()), "/cat.png")
+    assert request_data == ImageCacheKey(filepath="/cat.png", fs_hash=plugin_hash).to_cache_dict()
+
+def test_openai_client_is_shared_until_key_changes(monkeypatch):
+    """Test that generations reuse one OpenAI client per API key."""
+    from touchfs.content import client as client_module
+    monkeypatch.setattr(client_module, "_client", None)
+    monkeypatch.setattr(client_module, "_client_lock", client_module._client_lock)
+    monkeypatch.setattr(client_module, "_prewarmed", client_module._prewarmed)
+    monkeypatch.setattr(client_module, "ensure_env_loaded", lambda: None)
+    monkeypatch.setenv("OPENAI_API_KEY", "key-one")
+    monkeypatch.delenv("TOUCHFS_HTTP_MAX_CONN", raising=False)
+    with patch.object(client_module, "OpenAI", side_effect=lambda **kwargs: MagicMock()) as mock_openai:
+        first = client_module.get_openai_client()
+        assert client_module.get_openai_client() is first
+        assert mock_openai.call_count == 1
+
+        monkeypatch.setenv("OPENAI_API_KEY", "key-two")
+        assert client_module.get_openai_client() is not first
+        assert mock_openai.call_count == 2
+        first.close.assert_called_once()
+
+        # The serving process drops the client the mount command created
+        second = client_module.get_openai_client()
+        client_module.reset_openai_client()
+        assert client_module.get_openai_client() is not second
+        assert mock_openai.call_count == 3
+
+def test_http_pool_size_requires_valid_setting(monkeypatch):
+    """Test that the OpenAI HTTP defaults are kept unless a valid pool size is set."""
+    from touchfs.content import client as client_module
+    monkeypatch.delenv("TOUCHFS_HTTP_MAX_CONN", raising=False)
+    assert client_module._create_http_client() is None
+    for value in ("many", "0"):
+        monkeypatch.setenv("TOUCHFS_HTTP_MAX_CONN", value)
+        assert client_module._create_http_client() is None
+
+def test_prewarm_runs_once_and_ignores_errors(monkeypatch):
+    """Test that the connection pre-warm is started once and never raises."""
+    from touchfs.content import client as client_module
+    monkeypatch.setattr(client_module, "_prewarmed", False)
+    calls = []
+    def failing_client():
+        calls.append(1)
+        raise ValueError("OPENAI_API_KEY environment variable is required")
+    monkeypatch.setattr(client_module, "get_openai_client", failing_client)
+    started = []
+    monkeypatch.setattr(client_module.threading, "Thread",
+                        lambda target, **kwargs: MagicMock(start=lambda: started.append(target())))
+
+    client_module.prewarm_openai_client()
+    client_module.prewarm_openai_client()
+    assert len(started) == 1
+    assert len(calls) == 1
@@ -102,5 +102,31 @@ def test_log_rotation(caplog, tmp_path):
     remaining_files = list(log_dir.glob("touchfs.log.*"))
     assert len(remaining_files) == 0, f"Rotated files remain after cleanup: {remaining_files}"
 
+def test_json_formatter():
+    """Test JSON log records carry the detailed fields."""
+    import json
+    from touchfs.config.logger import JsonFormatter
+    record = logging.LogRecord("touchfs", logging.WARNING, "/src/touchfs/mod.py", 42, "value %s", (7,), None)
+    
+    entry = json.loads(JsonFormatter("mount").format(record))
+    assert entry["level"] == "WARNING"
+    assert entry["command"] == "mount"
+    assert entry["file"] == "mod.py"
+    assert entry["line"] == 42
+    assert entry["msg"] == "value 7"
+    assert "exc" not in entry
+
+def test_short_writes_are_completed(tmp_path, monkeypatch):
+    """Test a record cut short by os.write is written out in full."""
+    from touchfs.config.logger import ImmediateFileHandler
+    handler = ImmediateFileHandler(str(tmp_path / "touchfs.log"), command_name="test")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    real_write = os.write
+    monkeypatch.setattr(os, "write", lambda fd, data: real_write(fd, data[:3]))
+    
+    handler.emit(logging.LogRecord("touchfs", logging.INFO, __file__, 1, "partial write", None, None))
+    handler.close()
+    assert (tmp_path / "touchfs.log").read_text() == "partial write\n"
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
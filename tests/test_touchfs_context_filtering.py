@@ -0,0 +1,88 @@
+"""Tests for leaving .touchfs out of generation context and formatted structures.
+
+These don't mount a filesystem, so unlike test_touchfs_filtering.py they run
+without libfuse.
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+from touchfs.content.generator import generate_file_content
+
+def test_format_fs_structure_excludes_touchfs():
+    """Test that formatted filesystem structures leave out .touchfs entries."""
+    import json
+    from touchfs.config.filesystem import format_fs_structure
+    from touchfs.models.filesystem import FileNode, FileAttrs
+    
+    fs_structure = {
+        "/notes.txt": FileNode(type="file", content="hi", attrs=FileAttrs(st_mode="33188")),
+        "/.touchfs": FileNode(type="directory", children={}, attrs=FileAttrs(st_mode="16877")),
+        "/.touchfs/cache_stats": FileNode(type="file", attrs=FileAttrs(st_mode="33188")),
+    }
+    
+    formatted = json.loads(format_fs_structure(fs_structure))
+    assert list(formatted) == ["/notes.txt"]
+    assert formatted["/notes.txt"]["content"] == "hi"
+
+def test_context_filtering_leaves_structure_untouched():
+    """Test that filtering .touchfs out of the context doesn't modify the caller's nodes."""
+    mock_generator = MagicMock()
+    mock_generator.generate.return_value = "generated"
+    mock_registry = MagicMock()
+    mock_registry.get_generator.return_value = mock_generator
+    mock_registry.base.overlay_path = None
+
+    fs_structure = {
+        "/": {
+            "type": "directory",
+            "attrs": {"st_mode": "16877"},
+            "children": {"notes.txt": "/notes.txt", ".touchfs": "/.touchfs"}
+        },
+        "/notes.txt": {
+            "type": "file",
+            "attrs": {"st_mode": "33188"}
+        },
+        "/.touchfs": {
+            "type": "directory",
+            "attrs": {"st_mode": "16877"},
+            "children": {}
+        }
+    }
+
+    with patch('touchfs.content.generator.get_cache_enabled', return_value=False):
+        content = generate_file_content("/notes.txt", fs_structure, registry=mock_registry)
+    assert content == "generated"
+
+    _, _, fs_nodes = mock_generator.generate.call_args[0]
+    assert "/.touchfs" not in fs_nodes
+    assert fs_nodes["/"].children == {"notes.txt": "/notes.txt"}
+    assert fs_structure["/"]["children"] == {"notes.txt": "/notes.txt", ".touchfs": "/.touchfs"}
+
+def test_plugin_node_edits_leave_structure_untouched(tmp_path, monkeypatch):
+    """Test that a plugin editing its node doesn't edit the mounted structure."""
+    monkeypatch.setenv("TOUCHFS_CACHE_FOLDER", str(tmp_path))
+    nodes = []
+    def generate(path, node, fs_nodes):
+        nodes.append(node)
+        node.xattrs["generator"] = "default"
+        fs_nodes["/"].children["extra.txt"] = "/extra.txt"
+        return "generated"
+    mock_generator = MagicMock()
+    mock_generator.generate.side_effect = generate
+    mock_registry = MagicMock()
+    mock_registry.get_generator.return_value = mock_generator
+    mock_registry.base.overlay_path = None
+
+    fs_structure = {
+        "/": {"type": "directory", "attrs": {"st_mode": "16877"}, "children": {"a.txt": "/a.txt"}},
+        "/a.txt": {"type": "file", "attrs": {"st_mode": "33188"},
+                   "xattrs": {"touchfs.generate_content": b"true"}}
+    }
+
+    with patch('touchfs.content.generator.get_cache_enabled', return_value=False):
+        assert generate_file_content("/a.txt", fs_structure, registry=mock_registry) == "generated"
+        # The edited node no longer matches the structure, so it isn't reused
+        generate_file_content("/a.txt", fs_structure, registry=mock_registry)
+    assert nodes[1] is not nodes[0]
+    assert nodes[1].xattrs == {"touchfs.generate_content": "true", "generator": "default"}
+    assert fs_structure["/a.txt"]["xattrs"] == {"touchfs.generate_content": b"true"}
+    assert fs_structure["/"]["children"] == {"a.txt": "/a.txt"}
@@ -87,6 +87,18 @@ def test_tree_generation():
     assert "tree" in content_str, "tree generator should be mentioned"
     assert "model" in content_str, "model generator should be mentioned"
 
+def test_tree_reads_raw_nodes_with_bytes_xattrs():
+    """Test that raw structure nodes show their generator when xattrs hold bytes."""
+    structure = {
+        "/": {"type": "directory", "children": {"notes.txt": "/notes.txt"}, "attrs": {"st_mode": "16877"}},
+        "/notes.txt": {"type": "file", "attrs": {"st_mode": "33188"},
+                       "xattrs": {"generate_content": b"true"}}
+    }
+    
+    content = TreeGenerator().generate("/", create_file_node(), structure)
+    assert "🔄 default" in content
+    assert structure["/notes.txt"]["xattrs"] == {"generate_content": b"true"}
+
 def test_tree_can_handle():
     """Test that can_handle correctly identifies tree files."""
     generator = TreeGenerator()
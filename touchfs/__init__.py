@@ -1,18 +1,30 @@
 """TouchFS - A filesystem that generates content using LLMs."""
-from .core.memory import Memory
-from .core.jsonfs import JsonFS
-from .models.filesystem import FileSystem, FileNode, FileAttrs
-from .content.generator import generate_filesystem, generate_file_content
-from .config.settings import get_prompt, get_openai_key
-from .config.logger import setup_logging
+import importlib
 
 __version__ = "0.1.0"
 
+# Public names and the submodule that provides each of them. They are imported
+# on first access (PEP 562) so that importing a light submodule such as
+# touchfs.config.logger, or running `touchfs --help`, doesn't pull in fusepy,
+# pydantic and the OpenAI SDK.
+_LAZY_EXPORTS = {
+    "Memory": ".core.memory",
+    "JsonFS": ".core.jsonfs",
+    "FileSystem": ".models.filesystem",
+    "FileNode": ".models.filesystem",
+    "FileAttrs": ".models.filesystem",
+    "generate_filesystem": ".content.generator",
+    "generate_file_content": ".content.generator",
+    "get_prompt": ".config.settings",
+    "get_openai_key": ".config.settings",
+    "setup_logging": ".config.logger",
+}
+
 __all__ = [
     "Memory",
     "JsonFS",
     "FileSystem",
-    "FileNode", 
+    "FileNode",
     "FileAttrs",
     "generate_filesystem",
     "generate_file_content",
@@ -20,3 +32,12 @@ __all__ = [
     "get_openai_key",
     "setup_logging"
 ]
+
+def __getattr__(name):
+    """Import public names on first access and cache them on the package."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
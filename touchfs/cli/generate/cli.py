@@ -2,13 +2,33 @@
 
 import sys
 import os
+import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 
 from ...config.logger import setup_logging
+from ...config.settings import get_cache_enabled
 from ...core.context import build_context
 from ..touch.path_utils import create_file_with_xattr
-from ...content.filesystem_generator import generate_filesystem_list
+
+# Default number of files generated at once; override with TOUCHFS_GENERATE_WORKERS
+DEFAULT_GENERATE_WORKERS = 8
+
+def _generate_workers(num_files: int) -> int:
+    """Get how many files to generate in parallel.
+    
+    Args:
+        num_files: Number of files to generate
+        
+    Returns:
+        Number of worker threads to use, at least 1
+    """
+    try:
+        workers = int(os.environ.get("TOUCHFS_GENERATE_WORKERS", DEFAULT_GENERATE_WORKERS))
+    except ValueError:
+        workers = DEFAULT_GENERATE_WORKERS
+    return max(1, min(workers, num_files))
 
 def generate_main(
     files: List[str], 
@@ -19,7 +39,8 @@ def generate_main(
     filesystem_generation_prompt: Optional[str] = None,
     yes: bool = False,
     no_content: bool = False,
-    openai_client=None
+    openai_client=None,
+    batch: bool = False
 ) -> int:
     """Main entry point for generate command.
     
@@ -35,6 +56,7 @@ def generate_main(
         max_tokens: Maximum number of tokens to include in context
         filesystem_generation_prompt: Optional prompt for filesystem generation
         yes: Auto-confirm filesystem structure without prompting
+        batch: Generate the content of all files with a single request
         
     Returns:
         Exit code (0 for success, 1 for error)
@@ -67,6 +89,8 @@ def generate_main(
                         # Continue like touch command - don't return error
 
             try:
+                from ...content.filesystem_generator import generate_filesystem_list
+                
                 # Generate filesystem structure
                 print(f"\nGenerating filesystem from prompt: {filesystem_generation_prompt[:50]}...", file=sys.stdout)
                 sys.stdout.flush()
@@ -130,8 +154,9 @@ def generate_main(
                     if parent_dir:
                         os.makedirs(parent_dir, exist_ok=True)
                     
-                    # Create and optionally generate content for file
-                    import time
+                    # Create and optionally generate content for file. Files are
+                    # generated one at a time so each context includes the files
+                    # generated before it.
                     start_time = time.time()
                     context = build_context(parent_dir, max_tokens=max_tokens) if not no_content else None
                     result, _, content = create_file_with_xattr(abs_path, create_parents=True, 
@@ -189,25 +214,47 @@ def generate_main(
         else:
             context = None
 
-        # Process all approved paths
-        had_error = False
-        for path in abs_paths:
-            # Use touch command's file creation utility
-            import time
+        # With --batch, one request generates every new file up front. Its results
+        # land in the cache, where the per-file generation below picks them up.
+        if batch and not no_content:
+            if not get_cache_enabled():
+                print("Warning: --batch needs the cache enabled; generating files one by one", file=sys.stderr)
+            else:
+                new_paths = [path for path in abs_paths if not os.path.exists(path)]
+                if len(new_paths) > 1:
+                    try:
+                        from ...content.generator import generate_content_batch
+                        generated = generate_content_batch(new_paths, context)
+                        logger.debug(f"Batch generated {len(generated)} of {len(new_paths)} files")
+                    except Exception as e:
+                        logger.warning(f"Batch generation failed, generating files one by one: {e}")
+
+        def create(path):
             start_time = time.time()
             result, _, content = create_file_with_xattr(path, create_parents=parents, context=context, 
                                                       logger=logger, generate_content=not no_content)
-            if not result:
-                had_error = True
-            elif content:
-                lines = content.count('\n') + 1
-                chars = len(content)
-                duration = time.time() - start_time
-                print(f"Generated {path}: {chars} chars, {lines} lines in {duration:.2f}s")
-            elif not no_content:
-                print(f"Warning: No content was generated for {path}")
-            else:
-                print(f"Created empty file: {path}")
+            return result, content, time.time() - start_time
+
+        # Every file shares the context built above and generation mostly waits
+        # on the API, so files are generated in parallel. Missing parents without
+        # --parents make create_file_with_xattr prompt, so those run one by one.
+        workers = 1 if need_parents and not parents else _generate_workers(len(abs_paths))
+
+        # Process all approved paths, reporting them in the order given
+        had_error = False
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(create, abs_paths) if workers > 1 else map(create, abs_paths)
+            for path, (result, content, duration) in zip(abs_paths, results):
+                if not result:
+                    had_error = True
+                elif content:
+                    lines = content.count('\n') + 1
+                    chars = len(content)
+                    print(f"Generated {path}: {chars} chars, {lines} lines in {duration:.2f}s")
+                elif not no_content:
+                    print(f"Warning: No content was generated for {path}")
+                else:
+                    print(f"Created empty file: {path}")
                 
         if not had_error:
             print("(Generation complete)", file=sys.stderr)
@@ -279,6 +326,11 @@ Two modes of operation:
         action='store_true',
         help='Create empty files without generating content'
     )
+    generate_parser.add_argument(
+        '-b', '--batch',
+        action='store_true',
+        help='Generate all files with a single request (needs the cache enabled)'
+    )
     generate_parser.set_defaults(func=lambda args: sys.exit(generate_main(
         files=args.files,
         force=args.force,
@@ -287,7 +339,8 @@ Two modes of operation:
         max_tokens=args.max_tokens,
         filesystem_generation_prompt=args.filesystem_generation_prompt,
         yes=args.yes,
-        no_content=args.no_content
+        no_content=args.no_content,
+        batch=args.batch
     )))
     
     return generate_parser
@@ -306,5 +359,6 @@ def run(args=None):
         max_tokens=getattr(args, 'max_tokens', None),
         filesystem_generation_prompt=getattr(args, 'filesystem_generation_prompt', None),
         yes=getattr(args, 'yes', False),
-        no_content=getattr(args, 'no_content', False)
+        no_content=getattr(args, 'no_content', False),
+        batch=getattr(args, 'batch', False)
     ))
@@ -7,21 +7,37 @@ import os
 import sys
 import subprocess
 from typing import Optional
-from fuse import FUSE
 
-from ...core.memory import Memory
-from ...content.generator import generate_filesystem
 from ...config.settings import (
-    get_prompt,
     get_filesystem_generation_prompt,
-    set_cache_enabled,
     get_fsname,
     set_current_filesystem_prompt
 )
-from ...config.logger import setup_logging
+from ...config.logger import setup_logging, get_log_file
 from .filesystem import handle_filesystem_dialogue
 from .utils import get_mounted_touchfs
 
+def __getattr__(name):
+    """Import the FUSE and filesystem dependencies on first use (PEP 562).
+    
+    Listing mounts and building the CLI parser don't need fusepy, pydantic or
+    the OpenAI SDK, so they are only loaded once a mount actually happens.
+    """
+    if name == "FUSE":
+        from fuse import FUSE as value
+    elif name == "Memory":
+        from ...core.memory import Memory as value
+    elif name == "generate_filesystem":
+        from ...content.generator import generate_filesystem as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+def _lazy(name: str):
+    """Resolve a lazily imported module attribute (honours patched attributes)."""
+    return getattr(sys.modules[__name__], name)
+
 def mount_main(
     mountpoint: Optional[str] = None,
     prompt_arg: Optional[str] = None,
@@ -72,7 +88,6 @@ def mount_main(
     # Check if mountpoint is on a filesystem that supports FUSE
     if not unmount:
         try:
-            import subprocess
             result = subprocess.run(['df', '-T', mountpoint], capture_output=True, text=True)
             if result.returncode == 0:
                 output = result.stdout
@@ -112,31 +127,14 @@ def mount_main(
         logger.debug(f"Arguments: mountpoint={mountpoint}, foreground={foreground}")
         logger.debug("Checking log file...")
         
-        # Get the actual log file path from the logger
-        from ...config.logger import system_log_dir
-        system_log_file = os.path.join(system_log_dir, "touchfs.log") if system_log_dir else None
-        home_log_file = os.path.expanduser("~/.touchfs.log")
-        
-        # Check if either log file exists
-        log_file = None
-        if system_log_file and os.path.exists(system_log_file):
-            log_file = system_log_file
-        elif os.path.exists(home_log_file):
-            log_file = home_log_file
-            
+        # setup_logging already verified the "Logger initialized with rotation" test write,
+        # so only the existence of the log file it writes to needs to be confirmed here
+        log_file = get_log_file()
         if not log_file or not os.path.exists(log_file):
             if foreground:
                 print(f"ERROR: No log file was created", file=sys.stdout)
             return 1
-            
-        # Read log file to verify initial log message was written
-        with open(log_file, 'r') as f:
-            log_content = f.read()
-            if "Logger initialized with rotation" not in log_content:
-                if foreground:
-                    print(f"ERROR: Failed to verify log file initialization in {log_file}", file=sys.stdout)
-                return 1
-        
+
         logger.info(f"Main process started with PID: {os.getpid()}")
         logger.info("Setting up FUSE mount...")
     except Exception as e:
@@ -158,7 +156,7 @@ def mount_main(
         else:
             print("No filesystem generation prompt provided, starting with empty filesystem", file=sys.stdout)
             sys.stdout.flush()
-            initial_data = generate_filesystem("")["data"]
+            initial_data = _lazy("generate_filesystem")("")["data"]
             set_current_filesystem_prompt("")
 
         # Mount filesystem
@@ -166,20 +164,25 @@ def mount_main(
         tag_info = f" [{test_tag}]" if test_tag else ""
         
         logger.info(f"Mounting filesystem{tag_info} at {mountpoint} (foreground={foreground})")
-        memory = Memory(initial_data, mount_point=mountpoint)
+        memory = _lazy("Memory")(initial_data, mount_point=mountpoint)
         logger.info("Memory filesystem instance created")
         
-        # Configure FUSE options
+        # Configure FUSE options. Requests are dispatched on multiple threads
+        # unless --nothreads is given, so slow content generation for one file
+        # doesn't stall getattr/read calls on the rest of the tree. big_writes
+        # lets the kernel hand over up to 128KiB per write request instead of
+        # splitting writes into 4KiB pages.
         fuse_opts = {
             'foreground': foreground,
             'allow_other': allow_other,
             'allow_root': allow_root,
             'nothreads': nothreads,
             'nonempty': nonempty,
+            'big_writes': True,
             'fsname': get_fsname()
         }
         
-        fuse = FUSE(memory, mountpoint, **fuse_opts)
+        fuse = _lazy("FUSE")(memory, mountpoint, **fuse_opts)
         logger.info("FUSE mount completed")
         return 0
     except RuntimeError as e:
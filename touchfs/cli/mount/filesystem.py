@@ -7,7 +7,6 @@ interactive dialogue with users during filesystem generation.
 import os
 import sys
 from typing import Dict, Any, Optional
-from ...content.generator import generate_filesystem
 
 def format_simple_tree(data: Dict[str, Any], path: str = "/", indent: str = "") -> str:
     """Format a directory tree in a clean, standardized way.
@@ -67,6 +66,8 @@ def handle_filesystem_dialogue(initial_prompt: str, yes: bool = False) -> Option
     Returns:
         Generated filesystem data if successful, None if cancelled
     """
+    from ...content.generator import generate_filesystem
+    
     dialogue_history = []
     current_prompt = initial_prompt
     
@@ -111,22 +111,22 @@ def create_file_with_xattr(path: str, create_parents: bool = False, context: Opt
         parent_dir = os.path.dirname(path)
         if parent_dir and not os.path.exists(parent_dir):
             if create_parents:
-                os.makedirs(parent_dir)
+                os.makedirs(parent_dir, exist_ok=True)
             elif create_all:
-                os.makedirs(parent_dir)
+                os.makedirs(parent_dir, exist_ok=True)
             else:
                 # Prompt for directory creation
                 print(f"\nDirectory '{parent_dir}' does not exist.", file=sys.stderr)
                 while True:
                     response = input("Create directory? [y/n/a] (a=yes to all) ").lower()
                     if response == 'y':
-                        os.makedirs(parent_dir)
+                        os.makedirs(parent_dir, exist_ok=True)
                         break
                     elif response == 'n':
                         print(f"Skipping '{path}' - directory not created", file=sys.stderr)
                         return False, create_all
                     elif response == 'a':
-                        os.makedirs(parent_dir)
+                        os.makedirs(parent_dir, exist_ok=True)
                         # Create file with create_all=True
                         success, new_create_all, _ = create_file_with_xattr(path, create_parents=False, context=context, 
                                                                           logger=logger, create_all=True)
@@ -2,16 +2,18 @@
 
 import os
 import curses
-from typing import List, Tuple, Optional, Set
+from typing import List, Tuple, Optional, Set, TYPE_CHECKING
 from logging import Logger
-from openai import OpenAI
 
 from ...config import templates, model
 from ...core.context import build_context
-from ...models.filename_suggestions import FilenameSuggestions
 
-def get_openai_client() -> OpenAI:
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+def get_openai_client() -> "OpenAI":
     """Initialize OpenAI client with API key from environment."""
+    from openai import OpenAI
     api_key = model.get_openai_key()
     return OpenAI(api_key=api_key)
 
@@ -28,6 +30,8 @@ def generate_filename_suggestions(directory: str, selected_filenames: Optional[L
     Returns:
         List of 10 filename suggestions
     """
+    from ...models.filename_suggestions import FilenameSuggestions
+    
     try:
         # Build context from directory
         context = build_context(directory, max_tokens=max_tokens)
@@ -40,6 +40,10 @@ def main():
         parser.print_help()
         return 1
 
+    # Only load .env once a command actually runs, so --help stays cheap
+    from touchfs.config.env import ensure_env_loaded
+    ensure_env_loaded()
+
     # Call the appropriate command function
     return args.func(args)
 
@@ -5,6 +5,7 @@ from . import model
 from . import prompts
 from . import filesystem
 from . import features
+from . import env
 
 # Re-export all settings for backward compatibility
 from .settings import *
@@ -0,0 +1,18 @@
+"""Loading of environment variables from .env files."""
+
+_env_loaded = False
+
+def ensure_env_loaded() -> None:
+    """Load variables from a .env file into the environment once per process.
+    
+    python-dotenv walks up the directory tree looking for the file and parses
+    it, so this is done on first use by the CLI, the filesystem and the config
+    getters rather than when touchfs.config is imported. Variables that are
+    already set in the environment are not overridden.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    import dotenv
+    dotenv.load_dotenv()
@@ -2,14 +2,22 @@
 import logging
 import os
 import sys
+import time
 import fcntl
 import errno
-from pathlib import Path
 from typing import Any, Optional
 
+try:
+    import orjson
+except ImportError:  # Optional: JSON log output falls back to the standard library
+    orjson = None
+    import json
+
 # Global state
 _file_handler = None
 _logger_pid = None
+_logger: Optional[logging.Logger] = None  # Logger returned by the last full setup_logging run
+_logger_debug_stdout = False  # debug_stdout setting the cached logger was configured with
 system_log_dir = None  # Initialize at module level
 
 # Module logger
@@ -25,15 +33,82 @@ class CommandFilter(logging.Filter):
         record.command_name = self.command_name
         return True
 
+# Layout of the detailed log line produced by DetailedFormatter
+DETAILED_FORMAT = '%(filename)s:%(lineno)d - %(command_name)s - %(levelname)s - %(message)s'
+
+class DetailedFormatter(logging.Formatter):
+    """Formatter for the detailed TouchFS log line.
+    
+    Produces the same output as DETAILED_FORMAT, but builds the line
+    directly instead of interpreting the template for every record. The
+    command name is fixed per setup_logging call, so it is stored on the
+    formatter rather than looked up on each record.
+    """
+    def __init__(self, command_name: str = ""):
+        super().__init__(DETAILED_FORMAT)
+        self.command_name = command_name
+
+    def format(self, record: logging.LogRecord) -> str:
+        record.message = record.getMessage()
+        s = f"{record.filename}:{record.lineno} - {self.command_name} - {record.levelname} - {record.message}"
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            s = f"{s}\n{record.exc_text}"
+        if record.stack_info:
+            s = f"{s}\n{self.formatStack(record.stack_info)}"
+        return s
+
+
+class JsonFormatter(DetailedFormatter):
+    """Formatter emitting one JSON object per log record.
+    
+    Selected with TOUCHFS_LOG_FORMAT=json for log consumers that want
+    structured records. Uses orjson when it is installed and the json module
+    otherwise.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "level": record.levelname,
+            "command": self.command_name,
+            "file": record.filename,
+            "line": record.lineno,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if orjson is not None:
+            return orjson.dumps(entry, default=str).decode()
+        return json.dumps(entry, default=str)
+
+# Formatters are built once and shared by every setup_logging call (including
+# the re-setup after a fork); only their command name changes between calls
+_detailed_formatter = DetailedFormatter()
+_json_formatter = JsonFormatter()
+
+
+def _stdout_diag(enabled: bool, message: str) -> None:
+    """Write a logger diagnostic straight to stdout (foreground mode only).
+    
+    Used for problems with the logging setup itself, which can't be reported
+    through the logger being configured.
+    """
+    if enabled:
+        sys.stdout.write(f"{message}\n")
+        sys.stdout.flush()
 
-def _check_file_writable(path: Path, check_parent: bool = False) -> None:
+def _check_file_writable(path: str, check_parent: bool = False) -> None:
     """Check if a file is writable, raising PermissionError if not."""
-    if path.exists() and not os.access(path, os.W_OK):
+    if os.path.exists(path) and not os.access(path, os.W_OK):
         raise PermissionError(f"No write permission for file: {path}")
-    if check_parent and not os.access(path.parent, os.W_OK):
-        raise PermissionError(f"No write permission for directory: {path.parent}")
+    parent = os.path.dirname(path) or "."
+    if check_parent and not os.access(parent, os.W_OK):
+        raise PermissionError(f"No write permission for directory: {parent}")
 
-def _verify_file_creation(path: Path) -> None:
+def _verify_file_creation(path: str) -> None:
     """Verify we can create/write to a file, raising PermissionError if not."""
     try:
         # Try to open file for writing
@@ -44,31 +119,21 @@ def _verify_file_creation(path: Path) -> None:
             raise PermissionError(f"Cannot write to file: {path}")
         raise
 
-def _verify_file_rotation(log_file: Path) -> None:
-    """Verify we can rotate the log file, raising PermissionError if not."""
-    if not log_file.exists():
+def _verify_file_rotation(log_file: str) -> None:
+    """Verify we can rotate the log file, raising PermissionError if not.
+    
+    Rotation only renames the file within its directory, so write access to
+    the file and its directory is all that is needed; the file is not opened.
+    """
+    if not os.path.exists(log_file):
         return
     
     # Check if we can write to both the file and its parent directory
+    log_dir = os.path.dirname(log_file)
     if not os.access(log_file, os.W_OK):
         raise PermissionError(f"No write permission for file: {log_file}")
-    if not os.access(log_file.parent, os.W_OK):
-        raise PermissionError(f"No write permission for directory: {log_file.parent}")
-    
-    # Try to open the file to verify we can actually write to it
-    try:
-        with open(log_file, 'a') as f:
-            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-            try:
-                f.write("")
-                f.flush()
-                os.fsync(f.fileno())
-            finally:
-                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-    except (IOError, OSError) as e:
-        if e.errno in (errno.EACCES, errno.EPERM):
-            raise PermissionError(f"Cannot write to log file: {log_file}")
-        raise
+    if not os.access(log_dir, os.W_OK):
+        raise PermissionError(f"No write permission for directory: {log_dir}")
 
 def _reinit_logger_after_fork():
     """Reinitialize logger after fork to ensure proper file handles."""
@@ -83,9 +148,7 @@ def _reinit_logger_after_fork():
                     debug_stdout = True
                     break
         
-        if debug_stdout:
-            sys.stdout.write(f"DEBUG - Fork detected: Reinitializing logger for PID {current_pid}\n")
-            sys.stdout.flush()
+        _stdout_diag(debug_stdout, f"DEBUG - Fork detected: Reinitializing logger for PID {current_pid}")
         
         # Get a fresh logger instance
         logger = logging.getLogger("touchfs")
@@ -95,12 +158,9 @@ def _reinit_logger_after_fork():
                 # Close existing handler
                 _file_handler.close()
                 logger.removeHandler(_file_handler)
-                if debug_stdout:
-                    sys.stdout.write("DEBUG - Closed and removed existing file handler\n")
-                    sys.stdout.flush()
+                _stdout_diag(debug_stdout, "DEBUG - Closed and removed existing file handler")
             except Exception as e:
-                sys.stdout.write(f"WARNING - Error closing file handler: {str(e)}\n")
-                sys.stdout.flush()
+                _stdout_diag(True, f"WARNING - Error closing file handler: {str(e)}")
         
         # Get command name from existing filters before clearing
         command_name = ""
@@ -113,125 +173,144 @@ def _reinit_logger_after_fork():
         setup_logging(command_name=command_name, debug_stdout=debug_stdout)
         _logger_pid = current_pid
 
-class ImmediateFileHandler(logging.FileHandler):
-    """A FileHandler that flushes immediately after each write with file locking."""
-    _warning_counter = 0  # Class-level counter for warnings
-    _initial_warnings = 5  # Show first N warnings
-    _warning_threshold = 10  # Then show every Nth warning
-    _threshold_message_shown = False  # Track if we've shown the threshold message
+class ConsoleHandler(logging.StreamHandler):
+    """StreamHandler for the foreground debug output on stdout.
     
-    def _verify_file_access(self) -> None:
-        """Verify file can be opened and written to."""
-        try:
-            with open(self.baseFilename, 'a') as f:
-                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                f.write("")
-                f.flush()
-                os.fsync(f.fileno())
-                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-        except (IOError, OSError) as e:
-            if e.errno in (errno.EACCES, errno.EPERM):
-                if self.debug_stdout:
-                    sys.stdout.write(f"ERROR - File handler permission denied for {self.baseFilename}\n")
-                    sys.stdout.flush()
-                raise PermissionError(f"Cannot write to log file {self.baseFilename}: Permission denied")
-            error_msg = f"Cannot access log file {self.baseFilename}: {str(e)}"
-            if self.debug_stdout:
-                sys.stdout.write(f"ERROR - File handler IO error: {error_msg}\n")
-                sys.stdout.flush()
-            raise RuntimeError(error_msg)
-        except Exception as e:
-            error_msg = f"Cannot access log file {self.baseFilename}: {str(e)}"
-            if self.debug_stdout:
-                sys.stdout.write(f"ERROR - File handler unexpected error: {error_msg}\n")
-                sys.stdout.flush()
-            raise RuntimeError(error_msg)
+    StreamHandler flushes the stream after every record. A line-buffered
+    stream (stdout attached to a terminal) already flushes when the record's
+    newline is written, so the extra flush is only done when stdout is
+    redirected to a pipe or file.
+    """
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self._line_buffered = getattr(self.stream, "line_buffering", False)
 
+    def flush(self) -> None:
+        if not self._line_buffered:
+            super().flush()
+
+class ImmediateFileHandler(logging.FileHandler):
+    """A FileHandler that flushes immediately after each write.
+    
+    Each record is handed to the OS with a single os.write on the file
+    descriptor, which is opened in append mode (O_APPEND), so other processes
+    (and the .touchfs/log symlink) see it right away without going through the
+    stream's text buffer. Only records at WARNING level or above are
+    additionally forced to disk with fdatasync; routine DEBUG/INFO records skip
+    the per-record disk sync.
+    
+    An O_APPEND write lands atomically at the end of a local file, so records
+    from concurrent touchfs processes don't interleave without any locking.
+    Setting TOUCHFS_LOG_LOCK=1 wraps each record in an exclusive flock, for
+    log files on filesystems such as NFS where appends aren't atomic.
+    
+    Setting TOUCHFS_LOG_SYNC=1 makes every record durable instead: the log is
+    opened with O_DSYNC so each write completes only once it is on disk, and
+    no separate fdatasync call is needed.
+    """
+    _sync_level = logging.WARNING  # Records at or above this level are fdatasync'ed
+    
     def __init__(self, filename, mode='a', encoding=None, delay=False, debug_stdout=False, command_name=''):
         """Initialize the handler with verification."""
         self.debug_stdout = debug_stdout
         self.command_name = command_name
+        self._dsync = bool(os.environ.get("TOUCHFS_LOG_SYNC"))
+        self._lock_writes = bool(os.environ.get("TOUCHFS_LOG_LOCK"))
         # Check write permission before initializing
-        path = Path(filename)
-        _check_file_writable(path, check_parent=True)  # Need parent dir writable for rotation
+        _check_file_writable(os.fspath(filename), check_parent=True)  # Need parent dir writable for rotation
         super().__init__(filename, mode, encoding, delay)
-        self._verify_file_access()
+
+    def _open(self):
+        """Open the log stream, with O_DSYNC when every record must be durable."""
+        if not self._dsync:
+            return super()._open()
+        fd = os.open(self.baseFilename, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_DSYNC, 0o666)
+        return os.fdopen(fd, self.mode, encoding=self.encoding, errors=getattr(self, "errors", None))
 
     def emit(self, record: logging.LogRecord) -> None:
-        """Emit a record with file locking and immediate flush."""
+        """Emit a record with a single append write and immediate flush."""
         # Add command name to record
         record.command_name = self.command_name
         msg = self.format(record)
-        error_context = f"PID={os.getpid()}, File={self.baseFilename}"
         
         try:
-            if not self.stream:
+            # Lazily (re)open like FileHandler does; _open raises if that fails
+            if self.stream is None:
                 self.stream = self._open()
-                if not self.stream:
-                    raise IOError("Failed to open stream")
-            
-            # Verify stream is writable
-            if not self.stream.writable():
-                raise IOError("Stream not writable")
                 
-            # Acquire exclusive lock
-            fcntl.flock(self.stream.fileno(), fcntl.LOCK_EX)
-            initial_size = os.path.getsize(self.baseFilename)
-            
+            fd = self.stream.fileno()
+            data = memoryview((msg + self.terminator).encode(self.stream.encoding))
+            # Threads are already serialized by the handler lock; the flock
+            # is only needed across processes when appends aren't atomic
+            if self._lock_writes:
+                fcntl.flock(fd, fcntl.LOCK_EX)
             try:
-                self.stream.write(msg + self.terminator)
-                self.stream.flush()
-                os.fsync(self.stream.fileno())
-                
-                # Verify write actually occurred
-                new_size = os.path.getsize(self.baseFilename)
-                if new_size <= initial_size:
-                    ImmediateFileHandler._warning_counter += 1
-                    should_warn = False
-                    
-                    if ImmediateFileHandler._warning_counter <= ImmediateFileHandler._initial_warnings:
-                        should_warn = True
-                    elif not ImmediateFileHandler._threshold_message_shown:
-                        should_warn = True
-                        ImmediateFileHandler._threshold_message_shown = True
-                        warning_msg = f"Reducing write verification warnings frequency - will now show every {ImmediateFileHandler._warning_threshold}th warning ({error_context})"
-                    elif ImmediateFileHandler._warning_counter % ImmediateFileHandler._warning_threshold == 0:
-                        should_warn = True
-                        
-                    if should_warn:
-                        warning_msg = warning_msg if ImmediateFileHandler._threshold_message_shown else f"Write verification warning - file size did not increase ({error_context})"
-                        if self.debug_stdout:
-                            sys.stdout.write(f"WARNING - File handler write verification: {warning_msg}\n")
-                            sys.stdout.flush()
+                # O_APPEND writes to regular files are rarely short, but a
+                # signal or a full disk can cut one off; finish the record
+                while data:
+                    data = data[os.write(fd, data):]
+                if not self._dsync and record.levelno >= self._sync_level:
+                    os.fdatasync(fd)
             finally:
-                fcntl.flock(self.stream.fileno(), fcntl.LOCK_UN)
+                if self._lock_writes:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
                 
         except (IOError, OSError) as e:
             if e.errno in (errno.EACCES, errno.EPERM):
                 error_msg = f"Permission denied: {self.baseFilename}"
-                if self.debug_stdout:
-                    sys.stdout.write(f"ERROR - File handler permission denied: {error_msg}\n")
-                    sys.stdout.flush()
+                _stdout_diag(self.debug_stdout, f"ERROR - File handler permission denied: {error_msg}")
                 raise PermissionError(error_msg)
-            error_msg = f"Logging failed ({error_context}): {str(e)}"
-            if self.debug_stdout:
-                sys.stdout.write(f"ERROR - File handler IO error: {error_msg}\n")
-                sys.stdout.flush()
+            error_msg = f"Logging failed (PID={os.getpid()}, File={self.baseFilename}): {str(e)}"
+            _stdout_diag(self.debug_stdout, f"ERROR - File handler IO error: {error_msg}")
             raise RuntimeError(error_msg)
         except Exception as e:
-            error_msg = f"Logging failed ({error_context}): {str(e)}"
-            if self.debug_stdout:
-                sys.stdout.write(f"ERROR - File handler unexpected error: {error_msg}\n")
-                sys.stdout.flush()
+            error_msg = f"Logging failed (PID={os.getpid()}, File={self.baseFilename}): {str(e)}"
+            _stdout_diag(self.debug_stdout, f"ERROR - File handler unexpected error: {error_msg}")
             raise RuntimeError(error_msg)
 
+def get_log_file() -> Optional[str]:
+    """Get the path of the log file the TouchFS logger is writing to.
+    
+    Returns:
+        Path of the active log file, or None if logging hasn't been set up
+    """
+    return _file_handler.baseFilename if _file_handler else None
+
+def _get_cached_logger(command_name: str, force_new: bool, debug_stdout: bool, current_pid: int) -> Optional[logging.Logger]:
+    """Return the logger from a previous setup_logging call if it can be reused.
+    
+    The cached logger is only reused within the same process, when the log file
+    it writes to still exists and the stdout configuration is unchanged. The
+    command name is updated in place so records are attributed to the caller.
+    
+    Returns:
+        The cached logger, or None if a full setup is required
+    """
+    if force_new or command_name == "mount":
+        return None
+    if _logger is None or _file_handler is None or _logger_pid != current_pid:
+        return None
+    if _logger_debug_stdout != debug_stdout:
+        return None
+    if not os.path.exists(_file_handler.baseFilename):
+        return None
+    
+    _file_handler.command_name = command_name
+    for f in _logger.filters:
+        if isinstance(f, CommandFilter):
+            f.command_name = command_name
+    for handler in _logger.handlers:
+        if isinstance(handler.formatter, DetailedFormatter):
+            handler.formatter.command_name = command_name
+    return _logger
+
 def setup_logging(command_name: str = "", force_new: bool = False, test_tag: Optional[str] = None, debug_stdout: bool = False) -> logging.Logger:
     """Setup logging with full details at DEBUG level. Logs are only rotated by the mount command
     to ensure all client tool logs are preserved.
     
     The function performs the following steps:
     1. Creates log directory if it doesn't exist
-    2. Rotates existing log file with incremented suffix
+    2. Rotates existing log file with a timestamp suffix
     3. Sets up new log file with proper permissions
     4. Validates ability to write to new log file
     
@@ -251,12 +330,16 @@ def setup_logging(command_name: str = "", force_new: bool = False, test_tag: Opt
     global _logger_pid
     current_pid = os.getpid()
     
+    # Reuse the already configured logger when nothing relevant has changed.
+    # Mount always goes through the full setup since it is responsible for rotation.
+    cached = _get_cached_logger(command_name, force_new, debug_stdout, current_pid)
+    if cached is not None:
+        return cached
+    
     # Check if we need to reinitialize after fork
     if _logger_pid is not None and _logger_pid != current_pid:
         force_new = True
-        if debug_stdout:
-            sys.stdout.write(f"DEBUG - Fork detected: Old PID {_logger_pid}, New PID {current_pid}\n")
-            sys.stdout.flush()
+        _stdout_diag(debug_stdout, f"DEBUG - Fork detected: Old PID {_logger_pid}, New PID {current_pid}")
     
     # Create or get logger with error handling
     try:
@@ -276,26 +359,26 @@ def setup_logging(command_name: str = "", force_new: bool = False, test_tag: Opt
             logger.propagate = True
             logging.getLogger().setLevel(logging.DEBUG)  # Set root logger to DEBUG
         except Exception as e:
-            if debug_stdout:
-                sys.stdout.write(f"WARNING - Logger configuration error: {str(e)}\n")
-                sys.stdout.flush()
+            _stdout_diag(debug_stdout, f"WARNING - Logger configuration error: {str(e)}")
             # Continue since these are non-critical operations
     except Exception as e:
-        if debug_stdout:
-            sys.stdout.write(f"ERROR - Failed to initialize logger: {str(e)}\n")
-            sys.stdout.flush()
+        _stdout_diag(debug_stdout, f"ERROR - Failed to initialize logger: {str(e)}")
         raise RuntimeError(f"Failed to initialize logger: {str(e)}")
 
     # Setup detailed console handler for stdout if debug_stdout is enabled
     # Setup detailed formatter for all logging
-    detailed_formatter = logging.Formatter(f'%(filename)s:%(lineno)d - %(command_name)s - %(levelname)s - %(message)s')
+    detailed_formatter = _detailed_formatter
+    detailed_formatter.command_name = command_name
     
-    # Add command filter to logger
+    # Add command filter to logger, replacing the one from any previous setup
+    # rather than stacking another, since every filter runs on every log call
+    for f in [f for f in logger.filters if isinstance(f, CommandFilter)]:
+        logger.removeFilter(f)
     command_filter = CommandFilter(command_name)
     logger.addFilter(command_filter)
     
     if debug_stdout:
-        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler = ConsoleHandler(sys.stdout)
         console_handler.setLevel(logging.DEBUG)
         console_handler.setFormatter(detailed_formatter)
         logger.addHandler(console_handler)
@@ -308,40 +391,31 @@ def setup_logging(command_name: str = "", force_new: bool = False, test_tag: Opt
     
     try:
         # Try system log directory
-        log_path = Path(system_log_dir)
         try:
-            log_path.mkdir(parents=True, exist_ok=True)
+            os.makedirs(system_log_dir, exist_ok=True)
             if os.access(system_log_dir, os.W_OK):
                 log_dir = system_log_dir
-                log_file = log_path / "touchfs.log"
-                if log_file.exists() and os.access(log_file, os.W_OK):
-                    if debug_stdout:
-                        sys.stdout.write(f"INFO - Log setup: Using system log file {log_file}\n")
-                        sys.stdout.flush()
+                log_file = os.path.join(system_log_dir, "touchfs.log")
+                if os.path.exists(log_file) and os.access(log_file, os.W_OK):
+                    _stdout_diag(debug_stdout, f"INFO - Log setup: Using system log file {log_file}")
                 else:
                     # Try creating the file to verify write access
                     try:
                         _verify_file_creation(log_file)
-                        if debug_stdout:
-                            sys.stdout.write(f"INFO - Log setup: Created system log file {log_file}\n")
-                            sys.stdout.flush()
+                        _stdout_diag(debug_stdout, f"INFO - Log setup: Created system log file {log_file}")
                     except:
                         raise PermissionError("Cannot write to system log file")
             else:
                 raise PermissionError("No write permission for system log directory")
         except Exception as e:
-            if debug_stdout:
-                sys.stdout.write(f"WARNING - Log setup: System log failed, falling back to home directory: {str(e)}\n")
-                sys.stdout.flush()
+            _stdout_diag(debug_stdout, f"WARNING - Log setup: System log failed, falling back to home directory: {str(e)}")
             raise
 
     except Exception:
         # Fall back to home directory
         log_dir = os.path.dirname(home_log_file)
-        log_file = Path(home_log_file)
-        if debug_stdout:
-            sys.stdout.write(f"INFO - Log setup: Using home directory log file {log_file}\n")
-            sys.stdout.flush()
+        log_file = home_log_file
+        _stdout_diag(debug_stdout, f"INFO - Log setup: Using home directory log file {log_file}")
     
     # Verify we can rotate the log file if it exists
     _verify_file_rotation(log_file)
@@ -352,38 +426,40 @@ def setup_logging(command_name: str = "", force_new: bool = False, test_tag: Opt
         handler.setFormatter(detailed_formatter)
     
     # Only rotate logs for mount command
-    if command_name == "mount" and log_file.exists():
+    if command_name == "mount":
         try:
-            # Find next available suffix number in the current directory
-            parent_dir = log_file.parent
-            suffix = 1
-            while (parent_dir / f"touchfs.log.{suffix}").exists():
-                suffix += 1
+            # Suffix the backup with the rotation time instead of probing for the
+            # next free number, which costs one stat per previous rotation. The
+            # fixed-width nanosecond timestamp also keeps backups sorted by name.
+            backup_path = os.path.join(log_dir, f"touchfs.log.{time.time_ns()}")
             
-            # Rename existing log file with suffix
-            backup_path = parent_dir / f"touchfs.log.{suffix}"
-            log_file.rename(backup_path)
+            # A missing log shows up as ENOENT here, so it isn't stat'ed first
+            try:
+                os.rename(log_file, backup_path)
+            except FileNotFoundError:
+                backup_path = None
             
-            if debug_stdout:
-                sys.stdout.write(f"INFO - Log rotation: Rotated {log_file} to {backup_path}\n")
-                sys.stdout.flush()
+            if backup_path:
+                _stdout_diag(debug_stdout, f"INFO - Log rotation: Rotated {log_file} to {backup_path}")
                 
         except Exception as e:
-            if debug_stdout:
-                sys.stdout.write(f"ERROR - Log rotation failed: {str(e)}\n")
-                sys.stdout.flush()
+            _stdout_diag(debug_stdout, f"ERROR - Log rotation failed: {str(e)}")
             # Continue without rotation rather than failing
     
     # Setup file handler for single log file with immediate flush in append mode
     try:
         file_handler = ImmediateFileHandler(
-            str(log_file),  # Convert Path to string
+            log_file,
             mode='a',
             debug_stdout=debug_stdout,
             command_name=command_name
         )
         file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(detailed_formatter)
+        if os.environ.get("TOUCHFS_LOG_FORMAT", "").lower() == "json":
+            _json_formatter.command_name = command_name
+            file_handler.setFormatter(_json_formatter)
+        else:
+            file_handler.setFormatter(detailed_formatter)
         
         # Test write to new log file with robust error handling
         try:
@@ -391,52 +467,42 @@ def setup_logging(command_name: str = "", force_new: bool = False, test_tag: Opt
                 "touchfs", logging.INFO, __file__, 0,
                 "Logger initialized with rotation", (), None
             )
-            if debug_stdout:
-                sys.stdout.write("DEBUG - Attempting test write to log file\n")
-                sys.stdout.flush()
+            _stdout_diag(debug_stdout, "DEBUG - Attempting test write to log file")
             
             file_handler.emit(test_record)
             
             # Verify the write actually occurred
             if not os.path.exists(log_file):
                 error_msg = f"Log file does not exist after test write: {log_file}"
-                if debug_stdout:
-                    sys.stdout.write(f"ERROR - Log initialization: {error_msg}\n")
-                    sys.stdout.flush()
+                _stdout_diag(debug_stdout, f"ERROR - Log initialization: {error_msg}")
                 raise RuntimeError(error_msg)
             
             if os.path.getsize(log_file) == 0:
                 error_msg = f"Log file is empty after test write: {log_file}"
-                if debug_stdout:
-                    sys.stdout.write(f"ERROR - Log initialization: {error_msg}\n")
-                    sys.stdout.flush()
+                _stdout_diag(debug_stdout, f"ERROR - Log initialization: {error_msg}")
                 raise RuntimeError(error_msg)
                 
-            if debug_stdout:
-                sys.stdout.write("DEBUG - Test write successful\n")
-                sys.stdout.flush()
+            _stdout_diag(debug_stdout, "DEBUG - Test write successful")
                 
         except Exception as e:
             error_msg = f"Test write failed: {str(e)}"
-            if debug_stdout:
-                sys.stdout.write(f"ERROR - Log initialization: {error_msg}\n")
-                sys.stdout.flush()
+            _stdout_diag(debug_stdout, f"ERROR - Log initialization: {error_msg}")
             raise RuntimeError(error_msg)
         
         # Add handler to logger
         logger.addHandler(file_handler)
         
         # Store handler in global to prevent garbage collection
-        global _file_handler
+        global _file_handler, _logger, _logger_debug_stdout
         _file_handler = file_handler
+        _logger = logger
+        _logger_debug_stdout = debug_stdout
         
         return logger
         
     except Exception as e:
         error_msg = f"Failed to setup/test file handler: {str(e)}"
-        if debug_stdout:
-            sys.stdout.write(f"ERROR - Log initialization: {error_msg}\n")
-            sys.stdout.flush()
+        _stdout_diag(debug_stdout, f"ERROR - Log initialization: {error_msg}")
         if isinstance(e, PermissionError):
             raise
         raise RuntimeError(error_msg)
@@ -2,13 +2,16 @@
 import logging
 import os
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+from .env import ensure_env_loaded
 
 logger = logging.getLogger("touchfs")
 
 # Global model configuration
 _current_model = "gpt-4o-2024-08-06"
 _overlay_path = None
+# Parsed model files keyed by path, with the (mtime_ns, size) they were read at
+_model_file_cache: Dict[str, Tuple[Tuple[int, int], Optional[str]]] = {}
 
 def set_overlay_path(path: Optional[str]) -> None:
     """Set the overlay path for finding model configuration files.
@@ -23,6 +26,10 @@ def set_overlay_path(path: Optional[str]) -> None:
 def _read_model_file(path: str) -> Optional[str]:
     """Read model configuration from a file.
     
+    get_model() is consulted for every generation, so the parsed result is
+    kept until the file's mtime or size changes and repeat lookups cost a
+    single stat().
+    
     Args:
         path: Path to model configuration file
         
@@ -30,20 +37,31 @@ def _read_model_file(path: str) -> Optional[str]:
         Model configuration if file exists and is valid, None otherwise
     """
     try:
-        if os.path.exists(path):
-            with open(path, 'r') as f:
-                content = f.read().strip()
-                # Try parsing as JSON first
-                try:
-                    config = json.loads(content)
-                    if isinstance(config, dict) and "model" in config:
-                        return config["model"]
-                except json.JSONDecodeError:
-                    # Not JSON, treat as plain model name
-                    return content
+        st = os.stat(path)
+    except OSError:
+        return None
+    version = (st.st_mtime_ns, st.st_size)
+    cached = _model_file_cache.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    model = None
+    try:
+        with open(path, 'r') as f:
+            content = f.read().strip()
+            # Try parsing as JSON first
+            try:
+                config = json.loads(content)
+                if isinstance(config, dict) and "model" in config:
+                    model = config["model"]
+            except json.JSONDecodeError:
+                # Not JSON, treat as plain model name
+                model = content
     except Exception as e:
         logger.debug(f"Error reading model file {path}: {e}")
-    return None
+        return None
+    _model_file_cache[path] = (version, model)
+    return model
 
 def get_model() -> str:
     """Get current model configuration.
@@ -59,6 +77,7 @@ def get_model() -> str:
         str: Current model name
     """
     # Check environment first
+    ensure_env_loaded()
     if env_model := os.getenv("TOUCHFS_DEFAULT_MODEL"):
         return env_model.strip()
         
@@ -104,6 +123,7 @@ def get_openai_key() -> str:
     Raises:
         ValueError: If API key is not set
     """
+    ensure_env_loaded()
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("OPENAI_API_KEY environment variable is required")
@@ -2,8 +2,9 @@
 import os
 import json
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from . import templates
+from .env import ensure_env_loaded
 
 logger = logging.getLogger("touchfs")
 
@@ -11,6 +12,10 @@ logger = logging.getLogger("touchfs")
 _last_final_prompt = ""  # Last complete prompt sent to LLM
 _filesystem_prompt = ""  # Last filesystem generation prompt used
 _overlay_path = None  # Path to overlay directory
+# Stripped prompt file contents keyed by path, with the (mtime_ns, size) they were read at
+_prompt_file_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+# Prompt parsed from each cached file, with the cached contents it was parsed from
+_parsed_prompt_cache: Dict[str, Tuple[str, Optional[str]]] = {}
 
 def set_overlay_path(path: Optional[str]) -> None:
     """Set the overlay path for finding prompt configuration files.
@@ -22,6 +27,31 @@ def set_overlay_path(path: Optional[str]) -> None:
     _overlay_path = path
     logger.debug(f"Set prompt overlay path to: {path}")
 
+def _read_cached(path: str) -> str:
+    """Read and strip a prompt file, reusing the last read while it is unchanged.
+    
+    Prompts are resolved for every generation, so a file whose mtime and size
+    match the cached read costs a single stat() instead of open+read+close.
+    
+    Args:
+        path: Path to the prompt file
+        
+    Returns:
+        Stripped file contents
+        
+    Raises:
+        OSError: If the file cannot be stat'ed or read
+    """
+    st = os.stat(path)
+    version = (st.st_mtime_ns, st.st_size)
+    cached = _prompt_file_cache.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    with open(path, 'r') as f:
+        content = f.read().strip()
+    _prompt_file_cache[path] = (version, content)
+    return content
+
 def _read_prompt_file(path: str) -> Optional[str]:
     """Read prompt configuration from a file.
     
@@ -32,20 +62,30 @@ def _read_prompt_file(path: str) -> Optional[str]:
         Prompt configuration if file exists and is valid, None otherwise
     """
     try:
-        if os.path.exists(path):
-            with open(path, 'r') as f:
-                content = f.read().strip()
-                # Try parsing as JSON first
-                try:
-                    config = json.loads(content)
-                    if isinstance(config, dict) and "prompt" in config:
-                        return config["prompt"]
-                except json.JSONDecodeError:
-                    # Not JSON, treat as plain prompt text
-                    return content
+        content = _read_cached(path)
+    except FileNotFoundError:
+        return None
     except Exception as e:
         logger.debug(f"Error reading prompt file {path}: {e}")
-    return None
+        return None
+    
+    # _read_cached hands back the same string while the file is unchanged,
+    # so the JSON parse only reruns after an edit
+    parsed = _parsed_prompt_cache.get(path)
+    if parsed is not None and parsed[0] is content:
+        return parsed[1]
+    
+    prompt = None
+    # Try parsing as JSON first
+    try:
+        config = json.loads(content)
+        if isinstance(config, dict) and "prompt" in config:
+            prompt = config["prompt"]
+    except json.JSONDecodeError:
+        # Not JSON, treat as plain prompt text
+        prompt = content
+    _parsed_prompt_cache[path] = (content, prompt)
+    return prompt
 
 def read_prompt_file(path: str) -> str:
     """Read prompt from a file.
@@ -60,8 +100,7 @@ def read_prompt_file(path: str) -> str:
         ValueError: If file cannot be read
     """
     try:
-        with open(path, 'r') as f:
-            return f.read().strip()
+        return _read_cached(path)
     except Exception as e:
         raise ValueError(f"Failed to read prompt file: {e}")
 
@@ -84,6 +123,7 @@ def get_prompt(prompt_arg: Optional[str] = None) -> str:
         return prompt_arg
 
     # Try environment variable
+    ensure_env_loaded()
     prompt = os.getenv("TOUCHFS_PROMPT")
     if prompt:
         return prompt
@@ -115,6 +155,7 @@ def get_filesystem_generation_prompt(prompt_arg: Optional[str] = None) -> Option
         return prompt_arg
 
     # Try environment variable
+    ensure_env_loaded()
     prompt = os.getenv("TOUCHFS_FILESYSTEM_GENERATION_PROMPT")
     if prompt:
         return prompt
@@ -186,6 +227,7 @@ def get_global_prompt(prompt_arg: Optional[str] = None) -> str:
         return prompt_arg
 
     # Try environment variable
+    ensure_env_loaded()
     if env_prompt := os.getenv("TOUCHFS_GLOBAL_PROMPT"):
         return env_prompt
         
@@ -1,6 +1,5 @@
 """Configuration settings and environment handling."""
 import os
-import dotenv
 import logging
 from typing import Optional
 
@@ -11,17 +10,56 @@ from . import filesystem
 from . import features
 from . import context
 from . import xattrs
+from . import env
 
 logger = logging.getLogger("touchfs")
 
+# Names re-exported by `from .settings import *` in touchfs.config. Without
+# this the star import also copies os, logging, the submodules and this
+# module's `logger`, and the latter shadows the touchfs.config.logger module.
+__all__ = [
+    "TOUCHFS_PREFIX",
+    "GENERATE_CONTENT_XATTR",
+    "GENERATOR_XATTR",
+    "CLI_CONTEXT_XATTR",
+    "ensure_env_loaded",
+    "DEFAULT_MAX_TOKENS",
+    "DEFAULT_TEXT_EXTENSIONS",
+    "SYSTEM_PROMPT_EXTENSION",
+    "CONTENT_GENERATION_SYSTEM_PROMPT_TEMPLATE",
+    "FILESYSTEM_GENERATION_SYSTEM_PROMPT_TEMPLATE",
+    "FILESYSTEM_GENERATION_WITH_CONTEXT_SYSTEM_PROMPT_TEMPLATE",
+    "IMAGE_GENERATION_SYSTEM_PROMPT_TEMPLATE",
+    "read_template",
+    "get_template_path",
+    "get_model",
+    "set_model",
+    "get_openai_key",
+    "read_prompt_file",
+    "get_prompt",
+    "get_filesystem_generation_prompt",
+    "get_last_final_prompt",
+    "set_last_final_prompt",
+    "get_current_filesystem_prompt",
+    "set_current_filesystem_prompt",
+    "get_global_prompt",
+    "find_nearest_prompt_file",
+    "find_nearest_model_file",
+    "format_fs_structure",
+    "get_cache_enabled",
+    "set_cache_enabled",
+    "DEFAULT_FSNAME",
+    "get_fsname",
+]
+
 # Export xattr definitions
 TOUCHFS_PREFIX = xattrs.TOUCHFS_PREFIX
 GENERATE_CONTENT_XATTR = xattrs.GENERATE_CONTENT
 GENERATOR_XATTR = xattrs.GENERATOR
 CLI_CONTEXT_XATTR = xattrs.CLI_CONTEXT
 
-# Load environment variables from .env file
-dotenv.load_dotenv()
+# .env files are loaded on first use rather than at import
+ensure_env_loaded = env.ensure_env_loaded
 
 # Re-export all components
 # Context settings
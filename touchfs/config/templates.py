@@ -1,5 +1,5 @@
 """Template management and configuration."""
-import pkg_resources
+import functools
 import logging
 from typing import Optional
 
@@ -22,11 +22,19 @@ def get_template_path(template_name: str) -> str:
     Returns:
         str: Full path to the template file
     """
+    # pkg_resources is slow to import, so only load it once a template is needed
+    import pkg_resources
     return pkg_resources.resource_filename('touchfs', f'templates/prompts/{template_name}')
 
+@functools.lru_cache(maxsize=None)
 def read_template(template_name: str) -> str:
     """Read a template file from the templates directory.
     
+    Templates ship with the package and don't change at runtime, so each one
+    is read once per process. This keeps the file read off the content
+    generation path, where the default prompt falls back to a template for
+    every generated file.
+    
     Args:
         template_name: Name of the template file
         
@@ -1,4 +1,12 @@
 """Content generation using OpenAI."""
-from .generator import generate_filesystem, generate_file_content
 
 __all__ = ["generate_filesystem", "generate_file_content"]
+
+def __getattr__(name):
+    """Import the generator (and the OpenAI SDK) only when it is actually used."""
+    if name in __all__:
+        from . import generator
+        value = getattr(generator, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,121 @@
+"""OpenAI client construction shared by the content generators."""
+import os
+import atexit
+import logging
+import threading
+from typing import Optional, Tuple
+from openai import OpenAI, DefaultHttpxClient
+from ..config.settings import ensure_env_loaded
+
+logger = logging.getLogger("touchfs")
+
+# Client shared by all generations, with the environment it was created for
+_client: Optional[OpenAI] = None
+_client_env: Optional[Tuple[str, Optional[str], Optional[str]]] = None
+_client_lock = threading.Lock()
+_prewarmed = False
+
+def _create_http_client() -> Optional[DefaultHttpxClient]:
+    """Create an HTTP client with the pool size from TOUCHFS_HTTP_MAX_CONN.
+
+    Without the variable the OpenAI defaults are used. With it, up to that
+    many connections may be open at once and half of them are kept alive,
+    so concurrent FUSE reads don't queue on a full pool. Only the pool
+    limits change; the SDK's default timeout is kept.
+
+    Returns:
+        HTTP client to pass to OpenAI, or None to use the defaults
+    """
+    max_conn = os.getenv("TOUCHFS_HTTP_MAX_CONN")
+    if not max_conn:
+        return None
+    try:
+        max_connections = int(max_conn)
+    except ValueError:
+        logger.warning(f"Ignoring invalid TOUCHFS_HTTP_MAX_CONN value: {max_conn}")
+        return None
+    if max_connections <= 0:
+        logger.warning(f"Ignoring invalid TOUCHFS_HTTP_MAX_CONN value: {max_conn}")
+        return None
+    import httpx
+    return DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max(1, max_connections // 2),
+            keepalive_expiry=30.0,
+        ),
+    )
+
+def get_openai_client() -> OpenAI:
+    """Get the shared OpenAI client, creating it on first use.
+
+    Each client owns an HTTP connection pool. Creating one per request
+    meant a new TLS handshake for every generated file, while a shared
+    client keeps its connections to the API open between requests. The
+    client is thread-safe, so FUSE worker threads share it too. A new one
+    is created if OPENAI_API_KEY, OPENAI_BASE_URL or TOUCHFS_HTTP_MAX_CONN
+    changes, and the replaced client's connections are closed.
+
+    Returns:
+        OpenAI client
+
+    Raises:
+        ValueError: If OPENAI_API_KEY is not set
+    """
+    global _client, _client_env
+    ensure_env_loaded()
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY environment variable is required")
+    env = (api_key, os.getenv("OPENAI_BASE_URL"), os.getenv("TOUCHFS_HTTP_MAX_CONN"))
+    with _client_lock:
+        if _client is None or _client_env != env:
+            if _client is not None:
+                _client.close()
+            _client = OpenAI(http_client=_create_http_client())
+            _client_env = env
+        return _client
+
+def _prewarm() -> None:
+    """Open a connection to the API with a cheap request."""
+    try:
+        get_openai_client().models.list()
+        logger.debug("OpenAI connection pre-warmed")
+    except Exception as e:
+        logger.debug(f"OpenAI connection pre-warm failed: {e}")
+
+def prewarm_openai_client() -> None:
+    """Connect to the API in the background before the first generation.
+
+    The first generation otherwise pays for DNS, TCP and the TLS handshake
+    before any token arrives. A models listing on a daemon thread leaves a
+    kept-alive connection in the shared client's pool for it instead. This
+    only runs once per process and failures are ignored; generation will
+    report them itself.
+    """
+    global _prewarmed
+    with _client_lock:
+        if _prewarmed:
+            return
+        _prewarmed = True
+    threading.Thread(target=_prewarm, name="touchfs-prewarm", daemon=True).start()
+
+def reset_openai_client() -> None:
+    """Forget the shared client so the next generation creates a new one.
+
+    The mount command may use the client before FUSE daemonizes. Its pooled
+    connections belong to that process, so the serving process calls this
+    once FUSE is up instead of reusing them.
+    """
+    global _client, _client_env, _client_lock, _prewarmed
+    _client = None
+    _client_env = None
+    _client_lock = threading.Lock()
+    _prewarmed = False
+
+def _close_client() -> None:
+    """Close the shared client's connections at interpreter exit."""
+    if _client is not None:
+        _client.close()
+
+atexit.register(_close_client)
@@ -1,33 +1,15 @@
 """Generator for filesystem lists using structured outputs."""
 
-from typing import Optional
-from openai import OpenAI
+import logging
+from typing import Optional, TYPE_CHECKING
 from pydantic import BaseModel
 from ..models.filesystem_list import FilesystemList
-from ..config.logger import setup_logging
 
-class FilesystemResponse(BaseModel):
-    files: list[str]
+if TYPE_CHECKING:
+    from openai import OpenAI
 
-def generate_filesystem_list(prompt: str, client: Optional[OpenAI] = None) -> FilesystemList:
-    """Generate a list of files from a prompt using structured output.
-    
-    Args:
-        prompt: The prompt describing what files to create
-        client: Optional OpenAI client to use
-        
-    Returns:
-        FilesystemList containing paths to create
-    """
-    logger = setup_logging(command_name="generate")
-    
-    if client is None:
-        client = OpenAI()
-    
-    logger.debug("Generating filesystem list with prompt: %s", prompt)
-    
-    # Create system prompt that explains the task
-    system_prompt = """You are a filesystem generator. Given a prompt, generate a list of files that should exist.
+# System prompt that explains the task; the same for every request
+_SYSTEM_PROMPT = """You are a filesystem generator. Given a prompt, generate a list of files that should exist.
     
     Rules:
     1. All paths should be relative to the project root
@@ -48,12 +30,35 @@ def generate_filesystem_list(prompt: str, client: Optional[OpenAI] = None) -> Fi
     
     Consider these file type relationships when generating the filesystem structure to ensure proper organization and dependencies.
     """
+
+class FilesystemResponse(BaseModel):
+    files: list[str]
+
+def generate_filesystem_list(prompt: str, client: Optional["OpenAI"] = None) -> FilesystemList:
+    """Generate a list of files from a prompt using structured output.
+    
+    Args:
+        prompt: The prompt describing what files to create
+        client: Optional OpenAI client to use; defaults to the shared client
+        
+    Returns:
+        FilesystemList containing paths to create
+    """
+    # Logging is configured by the command calling this; setting it up again
+    # here would replace its handlers, including the --debug-stdout one
+    logger = logging.getLogger("touchfs")
+    
+    if client is None:
+        from .client import get_openai_client
+        client = get_openai_client()
+    
+    logger.debug("Generating filesystem list with prompt: %s", prompt)
     
     # Call the API with structured output
     completion = client.beta.chat.completions.parse(
         model="gpt-4o-2024-08-06",
         messages=[
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": _SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ],
         response_format=FilesystemResponse
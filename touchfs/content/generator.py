@@ -1,16 +1,75 @@
 """Content generation using OpenAI's API and plugins."""
 import os
+import re
 import json
+import hashlib
 import logging
-from typing import Dict, Optional
-from openai import OpenAI
-from ..models.filesystem import FileSystem, GeneratedContent, FileNode, FileAttrs
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Tuple
+from ..models.filesystem import FileSystem, GeneratedContent, FileNode, FileAttrs, copy_xattrs
 from ..config.prompts import get_global_prompt
-from ..config.logger import setup_logging
 from ..config.settings import get_model, get_cache_enabled
+from .client import get_openai_client
 from .plugins.registry import PluginRegistry
-from ..core.cache import get_cached_response, cache_response
-from ..core.context.context import ContextBuilder
+from ..core.cache import get_cached_response, cache_response, request_lock
+
+try:
+    import orjson
+except ImportError:  # Optional: completions are parsed with the standard library instead
+    orjson = None
+
+__all__ = [
+    "generate_content",
+    "generate_content_batch",
+    "generate_filesystem",
+    "generate_file_content",
+    "get_openai_client",
+]
+
+# Matches "/.touchfs" itself and everything below it in a single C-level check
+_TOUCHFS_PATH = re.compile(r"/\.touchfs(?:/|\Z)")
+
+# Text file extensions included in the generation context
+_TEXT_FILE_EXTENSIONS = frozenset({
+    '.txt', '.md', '.py', '.js', '.jsx', '.ts', '.tsx', '.html', '.css', 
+    '.json', '.yaml', '.yml', '.sh', '.bash', '.conf', '.cfg', '.ini',
+    '.xml', '.rst', '.log', '.env', '.toml', '.sql', '.c', '.cpp', '.h',
+    '.hpp', '.java', '.rb', '.php', '.go', '.rs', '.swift'
+})
+
+def _direct_content_request(path: str, context: Optional[str]) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+    """Build the messages and cache key for generating a file outside a mount.
+    
+    Args:
+        path: Path of the file to generate content for
+        context: Optional context string to use for generation
+        
+    Returns:
+        Tuple of (chat messages, cache request data)
+    """
+    filename = os.path.basename(path)
+    
+    system_prompt = get_global_prompt()
+
+    messages = [
+        {"role": "system", "content": system_prompt}
+    ]
+    
+    # Add context if provided
+    if context:
+        messages.append({"role": "user", "content": f"Context:\n{context}"})
+        
+    messages.append({"role": "user", "content": f"Generate content for: {filename}"})
+    
+    request_data = {
+        "type": "direct_content",
+        "path": path,
+        "context": context,
+        "model": get_model()
+    }
+    return messages, request_data
 
 def generate_content(path: str, context: Optional[str] = None) -> str:
     """Generate content for a file using OpenAI with structured output.
@@ -26,38 +85,18 @@ def generate_content(path: str, context: Optional[str] = None) -> str:
         RuntimeError: If content generation fails
     """
     try:
-        client = get_openai_client()
-        
-        # Build system prompt based on file type
-        _, ext = os.path.splitext(path)
-        filename = os.path.basename(path)
+        messages, request_data = _direct_content_request(path, context)
         
-        system_prompt = get_global_prompt()
-
-        messages = [
-            {"role": "system", "content": system_prompt}
-        ]
-        
-        # Add context if provided
-        if context:
-            messages.append({"role": "user", "content": f"Context:\n{context}"})
-            
-        messages.append({"role": "user", "content": f"Generate content for: {filename}"})
-        
-        # Check cache first if enabled
-        if get_cache_enabled():
-            request_data = {
-                "type": "direct_content",
-                "path": path,
-                "context": context,
-                "model": get_model()
-            }
+        # Check cache first if enabled; a hit needs no API client or key
+        cache_enabled = get_cache_enabled()
+        if cache_enabled:
             cached = get_cached_response(request_data)
             if cached:
                 return cached
 
+        client = get_openai_client()
         completion = client.beta.chat.completions.parse(
-            model=get_model(),
+            model=request_data["model"],
             messages=messages,
             response_format=GeneratedContent,
             temperature=0.2
@@ -66,13 +105,7 @@ def generate_content(path: str, context: Optional[str] = None) -> str:
         content = completion.choices[0].message.parsed.content
         
         # Cache the result if enabled
-        if get_cache_enabled():
-            request_data = {
-                "type": "direct_content",
-                "path": path,
-                "context": context,
-                "model": get_model()
-            }
+        if cache_enabled:
             cache_response(request_data, content)
             
         return content
@@ -80,43 +113,78 @@ def generate_content(path: str, context: Optional[str] = None) -> str:
     except Exception as e:
         raise RuntimeError(f"Failed to generate content: {e}")
 
-def get_openai_client() -> OpenAI:
-    """Initialize OpenAI client with API key from environment."""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY environment variable is required")
-    return OpenAI()
-
-def generate_filesystem(prompt: Optional[str]) -> dict:
-    """Generate filesystem structure using OpenAI.
+def generate_content_batch(paths: List[str], context: Optional[str] = None) -> Dict[str, str]:
+    """Generate content for several files with a single OpenAI request.
+    
+    Files that share a context (as with `touchfs generate a b c`) otherwise pay
+    a request round trip, and send the same context, once per file. Here the
+    context is sent once, and the model returns a JSON object that maps each
+    path to its content. Every result is cached under the same key
+    generate_content uses for that file, so later generate_content calls for
+    these paths are cache hits. Paths already in the cache are not requested.
     
     Args:
-        prompt: User prompt describing desired filesystem structure. If None or empty,
-               returns a minimal valid filesystem with just the root directory.
+        paths: Paths of the files to generate content for
+        context: Optional context string shared by all files
         
     Returns:
-        Dict containing the generated filesystem structure
+        Dict mapping each path the response covered to its content. Paths the
+        model left out are missing; generate them with generate_content.
         
     Raises:
-        RuntimeError: If filesystem generation fails with a valid prompt
+        RuntimeError: If content generation fails
     """
-    # Return minimal filesystem if no prompt provided
-    if prompt is None or not prompt.strip():
-        return {
-            "data": {
-                "/": {
-                    "type": "directory",
-                    "children": {},
-                    "attrs": {
-                        "st_mode": "16877"  # directory with 755 permissions
-                    }
-                }
-            }
-        }
+    try:
+        cache_enabled = get_cache_enabled()
+        results: Dict[str, str] = {}
+        pending: Dict[str, Dict[str, Any]] = {}
+        for path in paths:
+            _, request_data = _direct_content_request(path, context)
+            cached = get_cached_response(request_data) if cache_enabled else None
+            if cached:
+                results[path] = cached
+            else:
+                pending[path] = request_data
+        if not pending:
+            return results
 
-    client = get_openai_client()
-    
-    system_prompt = """
+        messages = [{"role": "system", "content": get_global_prompt()}]
+        if context:
+            messages.append({"role": "user", "content": f"Context:\n{context}"})
+        file_list = "\n".join(f"- {path}" for path in pending)
+        messages.append({"role": "user", "content": (
+            f"Generate content for each of these {len(pending)} files:\n{file_list}\n\n"
+            "Respond with a JSON object whose keys are exactly these paths and "
+            "whose values are the complete content of each file."
+        )})
+
+        client = get_openai_client()
+        completion = client.chat.completions.create(
+            model=get_model(),
+            messages=messages,
+            response_format={"type": "json_object"},
+            temperature=0.2
+        )
+        response_content = completion.choices[0].message.content
+        generated = orjson.loads(response_content) if orjson is not None else json.loads(response_content)
+        if not isinstance(generated, dict):
+            raise ValueError("Batch response is not a JSON object")
+
+        for path, request_data in pending.items():
+            content = generated.get(path)
+            if not isinstance(content, str):
+                continue
+            results[path] = content
+            if cache_enabled:
+                cache_response(request_data, content)
+        return results
+
+    except Exception as e:
+        raise RuntimeError(f"Failed to generate content: {e}")
+
+# System prompt for filesystem generation and its hash, which stands in for the
+# full prompt text in cache keys
+_FILESYSTEM_SYSTEM_PROMPT = """
     You are a filesystem generator. Given a prompt, generate a JSON structure representing a filesystem.
     The filesystem must follow this exact structure:
     
@@ -160,45 +228,79 @@ def generate_filesystem(prompt: Optional[str]) -> dict:
     7. All paths must be absolute and normalized
     8. Root directory ("/") must always exist
     """
+_FILESYSTEM_SYSTEM_PROMPT_HASH = hashlib.sha256(_FILESYSTEM_SYSTEM_PROMPT.encode()).hexdigest()
 
-    try:
-        # Check cache first if enabled
-        if get_cache_enabled():
-            request_data = {
-                "type": "filesystem",
-                "prompt": prompt,
-                "model": get_model(),
-                "system_prompt": system_prompt
+def generate_filesystem(prompt: Optional[str]) -> dict:
+    """Generate filesystem structure using OpenAI.
+    
+    Args:
+        prompt: User prompt describing desired filesystem structure. If None or empty,
+               returns a minimal valid filesystem with just the root directory.
+        
+    Returns:
+        Dict containing the generated filesystem structure
+        
+    Raises:
+        RuntimeError: If filesystem generation fails with a valid prompt
+    """
+    # Return minimal filesystem if no prompt provided
+    if prompt is None or not prompt.strip():
+        return {
+            "data": {
+                "/": {
+                    "type": "directory",
+                    "children": {},
+                    "attrs": {
+                        "st_mode": "16877"  # directory with 755 permissions
+                    }
+                }
             }
+        }
+
+
+    try:
+        model = get_model()
+        request_data = {
+            "type": "filesystem",
+            "prompt": prompt,
+            "model": model,
+            "system_prompt_hash": _FILESYSTEM_SYSTEM_PROMPT_HASH
+        }
+
+        # Check cache first if enabled, before paying for an API client
+        cache_enabled = get_cache_enabled()
+        if cache_enabled:
             cached = get_cached_response(request_data)
             if cached:
                 return cached
 
         # Generate if not cached
-        model = get_model()
+        client = get_openai_client()
         messages = [
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": _FILESYSTEM_SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ]
         
-        # Log complete prompt metadata and messages in YAML format
+        # Log complete prompt metadata and messages in YAML format; the
+        # message dump includes the whole prompt, so only build it when it is shown
         logger = logging.getLogger("touchfs")
-        metadata_yaml = f"""prompt_metadata:
+        if logger.isEnabledFor(logging.DEBUG):
+            metadata_yaml = f"""prompt_metadata:
   type: filesystem_generation
   model: {model}
   temperature: 0.7
   num_messages: {len(messages)}
   response_format: json_object"""
-        logger.debug(metadata_yaml)
+            logger.debug(metadata_yaml)
         
-        # Format messages as YAML
-        messages_yaml = "messages:"
-        for msg in messages:
-            messages_yaml += f"\n  - role: {msg['role']}\n    content: |\n"
-            # Indent content lines for YAML block scalar
-            content_lines = msg['content'].split('\n')
-            messages_yaml += '\n'.join(f"      {line}" for line in content_lines)
-        logger.debug(messages_yaml)
+            # Format messages as YAML
+            messages_yaml = "messages:"
+            for msg in messages:
+                messages_yaml += f"\n  - role: {msg['role']}\n    content: |\n"
+                # Indent content lines for YAML block scalar
+                content_lines = msg['content'].split('\n')
+                messages_yaml += '\n'.join(f"      {line}" for line in content_lines)
+            logger.debug(messages_yaml)
         
         completion = client.chat.completions.create(
             model=model,
@@ -207,39 +309,297 @@ def generate_filesystem(prompt: Optional[str]) -> dict:
             temperature=0.7
         )
         
-        # Parse and validate the response
-        fs_data = json.loads(completion.choices[0].message.content)
+        # Parse and validate the response. The parsed dict (not the model) is
+        # what gets filtered, cached and mounted, so it is validated separately.
+        response_content = completion.choices[0].message.content
+        fs_data = orjson.loads(response_content) if orjson is not None else json.loads(response_content)
         FileSystem.model_validate(fs_data)
         
         # Only filter .touchfs entries if this is a user-generated filesystem
         if "data" in fs_data and prompt and not prompt.startswith("internal:"):
             filtered_data = {}
             for path, node in fs_data["data"].items():
-                if not path.startswith("/.touchfs/") and path != "/.touchfs":
+                if not _TOUCHFS_PATH.match(path):
                     if node.get("children"):
                         filtered_children = {}
                         for child_name, child_path in node["children"].items():
-                            if not child_path.startswith("/.touchfs/") and child_path != "/.touchfs":
+                            if not _TOUCHFS_PATH.match(child_path):
                                 filtered_children[child_name] = child_path
                         node["children"] = filtered_children
                     filtered_data[path] = node
             fs_data["data"] = filtered_data
 
         # Cache the result if enabled
-        if get_cache_enabled():
-            request_data = {
-                "type": "filesystem",
-                "prompt": prompt,
-                "model": get_model(),
-                "system_prompt": system_prompt
-            }
+        if cache_enabled:
             cache_response(request_data, fs_data)
 
         return fs_data
     except Exception as e:
         raise RuntimeError(f"Failed to generate filesystem: {e}")
 
-def generate_file_content(path: str, fs_structure: Dict[str, FileNode]) -> str:
+class _LazyFsNodes(Mapping):
+    """Read-only view of the generation context, built as plugins look at it.
+    
+    The context holds the directories and text files of the filesystem,
+    without the .touchfs tree unless a .touchfs file is being generated.
+    Selecting those nodes means a pass over the whole structure, and
+    validating a FileNode for each would cost more still. Yet on a cache hit
+    the plugin only looks up its nearest prompt file. Single lookups are
+    therefore answered from the structure directly. The selection pass runs
+    only when the view is iterated, and nodes are converted when accessed.
+    
+    Overlay files are listed under virtual paths that only the full pass
+    resolves, so with an overlay mounted every access goes through it.
+    """
+    def __init__(self, fs_structure: Dict[str, dict], in_touchfs: bool, registry: PluginRegistry):
+        self._structure = fs_structure
+        self._in_touchfs = in_touchfs
+        self._registry = registry
+        self._point_lookups = not getattr(getattr(registry, "base", None), "overlay_path", None)
+        self._raw: Optional[Dict[str, dict]] = None
+        self._nodes: Dict[str, FileNode] = {}
+
+    def context_node(self, path: str) -> Optional[dict]:
+        """Get the raw node for a path as plugins see it, or None if it is hidden.
+        
+        Unlike lookups through the mapping this also returns nodes that are
+        left out of the context, such as non-text files.
+        """
+        if path == '_plugin_registry' or (not self._in_touchfs and _TOUCHFS_PATH.match(path)):
+            return None
+        n = self._structure.get(path)
+        if n is None or self._in_touchfs:
+            return n
+        # Nodes are shared with the caller, so only a directory that actually
+        # lists .touchfs children is replaced by a filtered copy
+        children = n.get("children")
+        if children and any(_TOUCHFS_PATH.match(c) and c in self._structure for c in children.values()):
+            n = {**n, "children": {
+                name: c for name, c in children.items()
+                if not (_TOUCHFS_PATH.match(c) and c in self._structure)
+            }}
+        return n
+
+    def _lookup(self, path: str) -> dict:
+        """Get the raw context node for a path, running the full pass only if needed."""
+        if self._raw is None and self._point_lookups:
+            n = self.context_node(path)
+            if n is not None and (n["type"] == "directory" or (
+                    n["type"] == "file" and os.path.splitext(path.lower())[1] in _TEXT_FILE_EXTENSIONS)):
+                return n
+            raise KeyError(path)
+        return self._all()[path]
+
+    def _all(self) -> Dict[str, dict]:
+        """Select every context node in a single pass over the structure."""
+        raw_nodes = self._raw
+        if raw_nodes is not None:
+            return raw_nodes
+        in_touchfs = self._in_touchfs
+        registry = self._registry
+        # The .touchfs paths are matched once up front (filter() runs the
+        # regex without a Python-level loop); nodes and children are then
+        # excluded by set lookups
+        skipped = {'_plugin_registry'}
+        if not in_touchfs:
+            skipped.update(filter(_TOUCHFS_PATH.match, self._structure))
+        raw_nodes = {}
+        for p, n in self._structure.items():
+            if p in skipped:
+                continue
+            if not in_touchfs:
+                # Nodes are shared with the caller, so only a directory that
+                # actually lists .touchfs children is replaced by a filtered copy
+                children = n.get("children")
+                if children and not skipped.isdisjoint(children.values()):
+                    n = {**n, "children": {
+                        name: c for name, c in children.items() if c not in skipped
+                    }}
+            
+            # Always include directories
+            if n["type"] == "directory":
+                raw_nodes[p] = n
+            # For files, check extension
+            elif n["type"] == "file":
+                _, ext = os.path.splitext(p.lower())
+                if ext in _TEXT_FILE_EXTENSIONS:
+                    # Try to get content from underlying filesystem for context
+                    if n.get("overlay_path") and registry.base.overlay_path:
+                        # Get overlay directory name to use as root context
+                        overlay_dir = os.path.basename(registry.base.overlay_path.rstrip('/'))
+                        # Create virtual path with overlay context
+                        virtual_path = f"/{overlay_dir}{p}"
+                        underlying_content = registry.base.get_underlying_content(p)
+                        if underlying_content is not None:
+                            # Use virtual path that includes overlay directory
+                            raw_nodes[virtual_path] = {**n, "content": underlying_content}
+                            continue
+                        
+                    # If not from overlay, use original path
+                    raw_nodes[p] = n
+        self._raw = raw_nodes
+        return raw_nodes
+
+    def raw_nodes(self) -> Dict[str, dict]:
+        """Get the whole context as raw node dicts, without converting them.
+        
+        The returned dict is shared and must not be modified.
+        """
+        return self._all()
+
+    def __getitem__(self, path: str) -> FileNode:
+        node = self._nodes.get(path)
+        if node is None:
+            node = self._nodes[path] = _to_file_node(path, self._lookup(path))
+        return node
+
+    def __contains__(self, path) -> bool:
+        try:
+            self._lookup(path)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self._all())
+
+    def __len__(self) -> int:
+        return len(self._all())
+
+# FileNodes built by _to_file_node, keyed by path and evicted least recently
+# used first. Only the models are kept; the raw node dicts stay owned by the
+# filesystem structure.
+_file_node_cache: "OrderedDict[str, FileNode]" = OrderedDict()
+_file_node_cache_lock = threading.Lock()
+_FILE_NODE_CACHE_SIZE = 4096
+
+# FileAttrs shared by all nodes with the same mode and owner; a filesystem
+# typically only has a handful of combinations. Nothing assigns to FileAttrs
+# fields (plugins replace node.attrs as a whole), so sharing is safe.
+_file_attrs_cache: Dict[Tuple[Optional[str], Optional[str], Optional[str]], FileAttrs] = {}
+_FILE_ATTRS_CACHE_SIZE = 256
+
+def _node_unchanged(node_dict: dict, node: FileNode) -> bool:
+    """Check whether a FileNode still matches the raw node for its path.
+    
+    Content is shared with the raw node and compared by identity. Children
+    and xattrs are copies (a plugin may edit them), so they are compared by
+    value, which also notices a plugin having edited the cached node's copy.
+    """
+    attrs = node_dict["attrs"]
+    node_attrs = node.attrs
+    if not (
+        node_dict["type"] == node.type
+        and node_dict.get("content", "") is node.content
+        and node_dict.get("children") == node.children
+        and attrs.get("st_mode") == getattr(node_attrs, "st_mode", None)
+        and attrs.get("st_uid") == node_attrs.st_uid
+        and attrs.get("st_gid") == node_attrs.st_gid
+    ):
+        return False
+    xattrs = node_dict.get("xattrs")
+    node_xattrs = node.xattrs
+    if xattrs is None or node_xattrs is None:
+        return xattrs is node_xattrs
+    return len(xattrs) == len(node_xattrs) and all(
+        node_xattrs.get(k) == (v.decode() if isinstance(v, bytes) else v) for k, v in xattrs.items()
+    )
+
+def _to_file_node(path: str, node_dict: dict) -> FileNode:
+    """Convert a raw filesystem structure entry to a FileNode model.
+    
+    The structure is validated once when it is generated (see
+    generate_filesystem) and the memory filesystem keeps its attrs as
+    strings, so nodes are built with model_construct instead of running the
+    validators again on every generation. Children and xattrs are copied,
+    with bytes xattr values decoded as validation would, so a plugin that
+    edits its node leaves the mounted structure alone. Between generations
+    only a few nodes change, so the FileNode built for a path is reused for
+    as long as the raw node still matches it. Nodes with the same mode and
+    owner share one FileAttrs instance.
+    
+    Args:
+        path: Path of the node in the filesystem structure
+        node_dict: Raw node dictionary from the filesystem structure
+        
+    Returns:
+        FileNode model for the entry
+    """
+    with _file_node_cache_lock:
+        cached = _file_node_cache.get(path)
+        if cached is not None and _node_unchanged(node_dict, cached):
+            _file_node_cache.move_to_end(path)
+            return cached
+    attrs = node_dict["attrs"]
+    attrs_key = (attrs.get("st_mode"), attrs.get("st_uid"), attrs.get("st_gid"))
+    file_attrs = _file_attrs_cache.get(attrs_key)
+    if file_attrs is None:
+        if len(_file_attrs_cache) >= _FILE_ATTRS_CACHE_SIZE:
+            _file_attrs_cache.clear()
+        file_attrs = _file_attrs_cache[attrs_key] = FileAttrs.model_construct(**attrs)
+    children = node_dict.get("children")
+    node = FileNode.model_construct(
+        type=node_dict["type"],
+        content=node_dict.get("content", ""),
+        children=dict(children) if children is not None else None,
+        attrs=file_attrs,
+        xattrs=copy_xattrs(node_dict.get("xattrs"))
+    )
+    with _file_node_cache_lock:
+        _file_node_cache[path] = node
+        _file_node_cache.move_to_end(path)
+        if len(_file_node_cache) > _FILE_NODE_CACHE_SIZE:
+            _file_node_cache.popitem(last=False)
+    return node
+
+def forget_file_node(path: str) -> None:
+    """Drop the cached FileNode for a path that was removed from the filesystem.
+    
+    Args:
+        path: Path of the removed node
+    """
+    with _file_node_cache_lock:
+        _file_node_cache.pop(path, None)
+
+def _file_content_request_data(path: str, node: FileNode, fs_nodes: Mapping, generator) -> Dict[str, Any]:
+    """Build the cache request key for generating a file's content.
+    
+    Only stable elements go into the key; compute_cache_filename hashes it.
+    
+    Args:
+        path: Path of the file being generated
+        node: FileNode of the file being generated
+        fs_nodes: Filesystem context passed to the generator
+        generator: Plugin selected to generate the file
+        
+    Returns:
+        Request data dict identifying the generation in the cache
+    """
+    # For image files, use ImageCacheKey, hashing the same context the image
+    # plugin hashes. Only the contents matter, so the raw nodes are hashed
+    # without converting each one to a FileNode.
+    if path.lower().endswith(('.jpg', '.jpeg', '.png')):
+        from ..models.cache_keys import ImageCacheKey
+        from .plugins.image.cache import calculate_filesystem_hash
+        context = fs_nodes.raw_nodes() if isinstance(fs_nodes, _LazyFsNodes) else fs_nodes
+        fs_hash = calculate_filesystem_hash(context, path)
+        return ImageCacheKey(filepath=path, fs_hash=fs_hash).to_cache_dict()
+
+    try:
+        prompt = generator.get_prompt(path, node, fs_nodes)
+    except (AttributeError, NotImplementedError):
+        # Fallback if get_prompt not implemented
+        prompt = get_global_prompt()
+    return {
+        "type": "file_content",
+        "path": path,
+        "model": get_model(),
+        "prompt": prompt,
+        "file_type": node.type
+    }
+
+def generate_file_content(path: str, fs_structure: Dict[str, FileNode],
+                          registry: Optional[PluginRegistry] = None) -> str:
     """Generate content for a file using plugins or OpenAI.
     
     Content generation is triggered during size calculation (stat operations) and only occurs when:
@@ -254,6 +614,8 @@ def generate_file_content(path: str, fs_structure: Dict[str, FileNode]) -> str:
     Args:
         path: Path of the file to generate content for
         fs_structure: Dict containing the entire filesystem structure
+        registry: Plugin registry used to pick the generator. When omitted it is
+            taken from the legacy '_plugin_registry' entry of fs_structure
         
     Returns:
         Generated content for the file
@@ -268,110 +630,54 @@ def generate_file_content(path: str, fs_structure: Dict[str, FileNode]) -> str:
         logger.debug("Content generation disabled via TOUCHFS_DISABLE_GENERATION")
         return ""
     
-    # Get registry from fs_structure
-    registry = fs_structure.get('_plugin_registry')
+    # Fall back to a registry stored in fs_structure by older callers
+    if registry is None:
+        registry = fs_structure.get('_plugin_registry')
     if not registry:
         logger.error("No plugin registry found")
         raise RuntimeError("Plugin registry not available")
     logger.debug("status: plugin_registry_found")
     
-    # Create a copy of fs_structure without the registry for node conversion
-    fs_structure_copy = {k: v for k, v in fs_structure.items() if k != '_plugin_registry'}
-    
-    # Only filter .touchfs files if we're not accessing them directly
-    if not path.startswith("/.touchfs/") and path != "/.touchfs":
-        # Filter out .touchfs directory and its contents from context
-        filtered_structure = {}
-        for p, node in fs_structure_copy.items():
-            if not p.startswith("/.touchfs/") and p != "/.touchfs":
-                filtered_structure[p] = node
-                # If this is a directory, filter its children too
-                if node.get("children"):
-                    filtered_children = {}
-                    for child_name, child_path in node["children"].items():
-                        if not child_path.startswith("/.touchfs/") and child_path != "/.touchfs":
-                            filtered_children[child_name] = child_path
-                    node["children"] = filtered_children
-    else:
-        # Use unfiltered structure for .touchfs files
-        filtered_structure = fs_structure_copy
-
-    logger.debug(f"""structure_info:
-  filtered_keys: {list(filtered_structure.keys())}
+    in_touchfs = _TOUCHFS_PATH.match(path) is not None
+    node = None
+    generator = None
+    fs_nodes = None
+    if in_touchfs:
+        # Proc files under .touchfs are generated from their own node; the
+        # context below is only converted for plugins that declare they need it
+        try:
+            node = _to_file_node(path, fs_structure[path])
+        except Exception as e:
+            logger.error(f"Error converting to FileNode models: {e}", exc_info=True)
+            raise RuntimeError(f"Failed to convert filesystem structure: {e}")
+        generator = registry.get_generator(path, node)
+        if generator and not getattr(generator, "needs_full_context", False):
+            fs_nodes = {path: node}
+
+    if fs_nodes is None:
+        try:
+            # The context view selects the nodes plugins get to see (see
+            # _LazyFsNodes); a cache hit usually only needs a few lookups
+            fs_nodes = _LazyFsNodes(fs_structure, in_touchfs, registry)
+            target = fs_nodes.context_node(path)
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"""structure_info:
   target_path: {path}
-  node_structure: {filtered_structure.get(path, 'not_found')}""")
-    
-    try:
-        # Convert raw dictionary to FileNode model
-        node_dict = filtered_structure[path]
-        node = FileNode(
-            type=node_dict["type"],
-            content=node_dict.get("content", ""),
-            children=node_dict.get("children"),
-            attrs=FileAttrs(**node_dict["attrs"]),
-            xattrs=node_dict.get("xattrs")
-        )
+  node_structure: {target if target is not None else 'not_found'}""")
 
-        # Define text file extensions to include in context
-        TEXT_FILE_EXTENSIONS = {
-            '.txt', '.md', '.py', '.js', '.jsx', '.ts', '.tsx', '.html', '.css', 
-            '.json', '.yaml', '.yml', '.sh', '.bash', '.conf', '.cfg', '.ini',
-            '.xml', '.rst', '.log', '.env', '.toml', '.sql', '.c', '.cpp', '.h',
-            '.hpp', '.java', '.rb', '.php', '.go', '.rs', '.swift'
-        }
-        
-        # Convert remaining fs_structure to use FileNode models, filtering out non-text files
-        fs_nodes = {}
-        for p, n in filtered_structure.items():
-            # Always include directories
-            if n["type"] == "directory":
-                fs_nodes[p] = FileNode(
-                    type=n["type"],
-                    content=n.get("content", ""),
-                    children=n.get("children"),
-                    attrs=FileAttrs(**n["attrs"]),
-                    xattrs=n.get("xattrs")
-                )
-            # For files, check extension
-            elif n["type"] == "file":
-                _, ext = os.path.splitext(p.lower())
-                if ext in TEXT_FILE_EXTENSIONS:
-                    # Try to get content from underlying filesystem for context
-                    if n.get("overlay_path") and registry.base.overlay_path:
-                        # Get overlay directory name to use as root context
-                        overlay_dir = os.path.basename(registry.base.overlay_path.rstrip('/'))
-                        # Create virtual path with overlay context
-                        virtual_path = f"/{overlay_dir}{p}"
-                        underlying_content = registry.base.get_underlying_content(p)
-                        if underlying_content is not None:
-                            n["content"] = underlying_content
-                            # Use virtual path that includes overlay directory
-                            fs_nodes[virtual_path] = FileNode(
-                                type=n["type"],
-                                content=n.get("content", ""),
-                                children=n.get("children"),
-                                attrs=FileAttrs(**n["attrs"]),
-                                xattrs=n.get("xattrs")
-                            )
-                            continue
-                            
-                    # If not from overlay, use original path
-                    fs_nodes[p] = FileNode(
-                        type=n["type"],
-                        content=n.get("content", ""),
-                        children=n.get("children"),
-                        attrs=FileAttrs(**n["attrs"]),
-                        xattrs=n.get("xattrs")
-                    )
-    except Exception as e:
-        logger.error(f"Error converting to FileNode models: {e}", exc_info=True)
-        raise RuntimeError(f"Failed to convert filesystem structure: {e}")
+            # Convert raw dictionary to FileNode model
+            if node is None:
+                if target is None:
+                    raise KeyError(path)
+                node = _to_file_node(path, target)
+        except Exception as e:
+            logger.error(f"Error converting to FileNode models: {e}", exc_info=True)
+            raise RuntimeError(f"Failed to convert filesystem structure: {e}")
     
-    if not registry:
-        logger.error("No plugin registry found")
-        raise RuntimeError("Plugin registry not available")
-        
-    generator = registry.get_generator(path, node)
+    # Proc files already resolved their generator above
+    if generator is None:
+        generator = registry.get_generator(path, node)
     
     if not generator:
         logger.error(f"No generator found for path: {path}")
@@ -379,113 +685,36 @@ def generate_file_content(path: str, fs_structure: Dict[str, FileNode]) -> str:
         
     try:
         # Skip caching only for .touchfs proc files
-        is_proc_file = path.startswith("/.touchfs/")
+        is_proc_file = in_touchfs
         
-        # Check cache first if enabled and not a proc file
-        if get_cache_enabled() and not is_proc_file:
-            # Create minimal cache key with only stable elements
-            generator = registry.get_generator(path, node)
-            try:
-                prompt = generator.get_prompt(path, node, fs_nodes)
-            except (AttributeError, NotImplementedError):
-                # Fallback if get_prompt not implemented
-                prompt = get_global_prompt()
-            
-            # For image files, use ImageCacheKey
-            if path.lower().endswith(('.jpg', '.jpeg', '.png')):
-                # Calculate SHA256 hash of all relevant files
-                import hashlib
-                hasher = hashlib.sha256()
-                
-                # Sort files for deterministic hashing
-                for file_path in sorted(fs_nodes.keys()):
-                    # Skip the target image file
-                    if file_path == path:
-                        continue
-                        
-                    node = fs_nodes[file_path]
-                    if node.content:
-                        # Add path and content to hash
-                        hasher.update(file_path.encode())
-                        hasher.update(node.content if isinstance(node.content, bytes) else node.content.encode())
-                
-                fs_hash = hasher.hexdigest()
-                
-                # Use ImageCacheKey for consistent caching with image plugin
-                from ..models.cache_keys import ImageCacheKey
-                cache_key = ImageCacheKey(
-                    filepath=path,
-                    fs_hash=fs_hash
-                )
-                request_data = cache_key.to_cache_dict()
-            else:
-                request_data = {
-                    "type": "file_content",
-                    "path": path,
-                    "model": get_model(),
-                    "prompt": prompt,
-                    "file_type": node.type
-                }
-            cached = get_cached_response(request_data)
-            if cached:
-                logger.debug(f"""cache:
+        # Check cache first if enabled and not a proc file. The request key is
+        # built once here and reused when storing the generated content.
+        cache_enabled = get_cache_enabled()
+        request_data = None
+        if cache_enabled and not is_proc_file:
+            request_data = _file_content_request_data(path, node, fs_nodes, generator)
+
+        # Concurrent generations of the same request wait for the first one
+        # and are then answered from its cache entry
+        with request_lock(request_data) as cache_key:
+            if request_data is not None:
+                cached = get_cached_response(request_data, cache_key)
+                if cached:
+                    logger.debug(f"""cache:
   status: hit
   path: {path}""")
-                return cached
+                    return cached
 
-        # Generate content
-        content = generator.generate(path, node, fs_nodes)
+            # Generate content
+            content = generator.generate(path, node, fs_nodes)
 
-        # Cache the result if enabled and not a proc file
-        # For files with generate_content, cache after first generation
-        if get_cache_enabled() and not is_proc_file:
-            logger.debug(f"""cache:
+            # Cache the result if enabled and not a proc file
+            # For files with generate_content, cache after first generation
+            if request_data is not None:
+                logger.debug(f"""cache:
   status: store
   path: {path}""")
-            # Use same minimal cache key for storing
-            generator = registry.get_generator(path, node)
-            try:
-                prompt = generator.get_prompt(path, node, fs_nodes)
-            except (AttributeError, NotImplementedError):
-                # Fallback if get_prompt not implemented
-                prompt = get_global_prompt()
-            
-            # For image files, use ImageCacheKey
-            if path.lower().endswith(('.jpg', '.jpeg', '.png')):
-                # Calculate SHA256 hash of all relevant files
-                import hashlib
-                hasher = hashlib.sha256()
-                
-                # Sort files for deterministic hashing
-                for file_path in sorted(fs_nodes.keys()):
-                    # Skip the target image file
-                    if file_path == path:
-                        continue
-                        
-                    node = fs_nodes[file_path]
-                    if node.content:
-                        # Add path and content to hash
-                        hasher.update(file_path.encode())
-                        hasher.update(node.content if isinstance(node.content, bytes) else node.content.encode())
-                
-                fs_hash = hasher.hexdigest()
-                
-                # Use ImageCacheKey for consistent caching with image plugin
-                from ..models.cache_keys import ImageCacheKey
-                cache_key = ImageCacheKey(
-                    filepath=path,
-                    fs_hash=fs_hash
-                )
-                request_data = cache_key.to_cache_dict()
-            else:
-                request_data = {
-                    "type": "file_content",
-                    "path": path,
-                    "model": get_model(),
-                    "prompt": prompt,
-                    "file_type": node.type
-                }
-            cache_response(request_data, content)
+                cache_response(request_data, content, cache_key)
 
         return content
     except Exception as e:
@@ -83,6 +83,11 @@ class ContentGenerator(Protocol):
 class BaseContentGenerator(ABC):
     """Base class for content generators providing common functionality."""
     
+    # Whether generate() needs the rest of the filesystem as context when the
+    # generated file lives in .touchfs. Proc files that only report their own
+    # state get just their own node, skipping the context conversion.
+    needs_full_context: bool = False
+    
     def __init__(self):
         self.base = None  # Will be set by registry
     
@@ -2,18 +2,95 @@
 import logging
 import os
 import json
-from typing import Dict, List
+import time
+import heapq
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from .multiproc import MultiProcPlugin
 from .base import ProcFile, BaseContentGenerator
 from ...models.filesystem import FileNode
 from ... import config
-from ...core.cache import get_cache_dir
+from ...core.cache import get_cache_dir, summarize_cache_entry, SUMMARY_SUFFIX
 from ...core import cache_stats
 
+try:
+    import orjson
+except ImportError:  # Optional: cache files are parsed with the standard library
+    orjson = None
+
 logger = logging.getLogger("touchfs")
 
+# How long cache_stats and cache_list reuse a directory scan, in seconds
+_SCAN_TTL = 2.0
+
+# Number of cache files read concurrently for cache_list
+_LIST_READ_WORKERS = 16
+
+def _read_cache_file(path: str, size: int) -> Tuple[Optional[bytes], Optional[Exception]]:
+    """Read a cache file, returning its bytes or the error raised.
+    
+    Cache files are renamed into place whole, so the size from the directory
+    scan is normally exact and a single read() returns the whole file. A
+    buffered read would fstat the file and issue a second read to find EOF.
+    
+    Args:
+        path: Path of the cache file
+        size: Size of the file from the directory scan
+        
+    Returns:
+        Tuple of (file contents, None) or (None, error)
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            data = os.read(fd, size + 1)
+            if len(data) > size:  # Replaced by a larger entry since the scan
+                chunks = [data]
+                while chunk := os.read(fd, 65536):
+                    chunks.append(chunk)
+                data = b"".join(chunks)
+            return data, None
+        finally:
+            os.close(fd)
+    except Exception as e:
+        return None, e
+
+def _read_cache_summary(path: str) -> Optional[str]:
+    """Read the summary stored next to a cache file, if there is one.
+    
+    Args:
+        path: Path of the cache file
+        
+    Returns:
+        The entry's cache_list columns, or None for entries written without
+        one (or whose summary can't be read)
+    """
+    try:
+        with open(os.path.splitext(path)[0] + SUMMARY_SUFFIX, 'rb') as f:
+            summary = f.read().decode().rstrip("\n")
+    except (OSError, UnicodeDecodeError):
+        return None
+    return summary or None
+
+def _read_list_entry(path: str, size: int) -> Tuple[Optional[str], Optional[bytes], Optional[Exception]]:
+    """Read what cache_list needs for a cache file.
+    
+    Args:
+        path: Path of the cache file
+        size: Size of the file from the directory scan
+        
+    Returns:
+        Tuple of (summary, None, None) when a summary was stored, otherwise
+        (None, file contents, None) or (None, None, error)
+    """
+    summary = _read_cache_summary(path)
+    if summary is not None:
+        return summary, None, None
+    return (None,) + _read_cache_file(path, size)
+
 class CacheControlPlugin(MultiProcPlugin):
     """Plugin that provides cache control through proc-like files.
     
@@ -24,6 +101,20 @@ class CacheControlPlugin(MultiProcPlugin):
     - .touchfs/cache_list: Read-only list of cached request hashes
     """
     
+    def __init__(self):
+        super().__init__()
+        # Recent scan results by name, with the time and cache directory
+        # mtime they were computed at
+        self._scans: Dict[str, Tuple[float, Optional[int], Any]] = {}
+        self._scans_lock = threading.Lock()
+        # Handler for each proc file, by its path in .touchfs
+        self._handlers: Dict[str, Callable[[FileNode], str]] = {
+            "cache_enabled": self._handle_enabled,
+            "cache_stats": self._handle_stats,
+            "cache_clear": self._handle_clear,
+            "cache_list": self._handle_list,
+        }
+    
     def generator_name(self) -> str:
         return "cache_control"
     
@@ -31,126 +122,160 @@ class CacheControlPlugin(MultiProcPlugin):
     def can_handle(self, path: str, node: FileNode) -> bool:
         """Check if this generator should handle the given file."""
         return (path.startswith("/.touchfs/") and 
-                path.replace("/.touchfs/", "") in self.get_proc_paths() and
+                path[len("/.touchfs/"):] in self._handlers and
                 node.xattrs is not None and 
                 node.xattrs.get("generator") == self.generator_name())
 
     def get_proc_paths(self) -> list[str]:
         """Return paths for cache control files."""
-        return ["cache_enabled", "cache_stats", "cache_clear", "cache_list"]
+        return list(self._handlers)
+
+    def _cached_scan(self, name: str, scan: Callable[[], Any]) -> Any:
+        """Reuse a recent result of a cache directory scan.
+        
+        Reading cache_stats or cache_list in a watch loop would otherwise
+        rescan and reread the whole cache each time. A result is reused for
+        _SCAN_TTL seconds, unless the cache directory's mtime shows that
+        entries were added or removed in the meantime.
+        
+        Args:
+            name: Name of the scan, e.g. "size"
+            scan: Function computing the result
+            
+        Returns:
+            The cached or newly computed result
+        """
+        try:
+            dir_mtime = os.stat(get_cache_dir()).st_mtime_ns
+        except OSError:
+            dir_mtime = None
+        now = time.monotonic()
+        with self._scans_lock:
+            cached = self._scans.get(name)
+            if cached and now - cached[0] < _SCAN_TTL and cached[1] == dir_mtime:
+                return cached[2]
+        value = scan()
+        with self._scans_lock:
+            self._scans[name] = (now, dir_mtime, value)
+        return value
 
     def _get_cache_size(self) -> int:
         """Get total size of cache files in bytes."""
+        return self._cached_scan("size", self._scan_cache_size)
+
+    def _scan_cache_size(self) -> int:
+        """Add up the size of the cache files.
+        
+        The sizes come from the directory scan, so no cache file is opened.
+        """
         total = 0
-        cache_dir = get_cache_dir()
-        if cache_dir.exists():
-            for file in cache_dir.glob("*.json"):
-                try:
-                    with file.open('r') as f:
-                        data = json.load(f)
-                        if isinstance(data, dict) and "response" in data:
-                            total += len(json.dumps(data["response"]).encode())
-                        else:
-                            total += file.stat().st_size
-                except Exception:
-                    total += file.stat().st_size
+        for entry in self._cache_entries():
+            try:
+                total += entry.stat().st_size
+            except OSError:  # Removed since the scan
+                pass
         return total
 
+    def _cache_entries(self, suffixes: Tuple[str, ...] = (".json",)) -> List[os.DirEntry]:
+        """List the cache files in a single directory scan.
+        
+        os.scandir returns each entry's type with its name, and caches its
+        stat result on first use, so callers that need sizes or times don't
+        pay another system call per file.
+        
+        Args:
+            suffixes: Suffixes of the files to list; by default the entries
+                themselves, without their summaries
+        
+        Returns:
+            Directory entries of the matching cache files
+        """
+        try:
+            with os.scandir(get_cache_dir()) as it:
+                return [entry for entry in it if entry.name.endswith(suffixes) and entry.is_file()]
+        except FileNotFoundError:
+            return []
+
+    def _entries_with_ctime(self) -> Iterator[Tuple[os.DirEntry, float]]:
+        """Yield the cache files with their creation times."""
+        for entry in self._cache_entries():
+            try:
+                yield entry, entry.stat().st_ctime
+            except Exception as e:
+                logger.error(f"""cache_operation:
+  action: get_stats
+  status: error
+  file: {entry.path}
+  error: {str(e)}""")
+
     def _clear_cache(self):
         """Clear all cached files."""
         cache_dir = get_cache_dir()
         if cache_dir.exists():
-            for file in cache_dir.glob("*.json"):
+            for entry in self._cache_entries((".json", SUMMARY_SUFFIX)):
                 try:
-                    file.unlink()
+                    os.unlink(entry.path)
                 except Exception as e:
                     logger.error(f"""cache_operation:
   action: delete_file
   status: error
-  file: {file}
+  file: {entry.path}
   error: {str(e)}""")
             logger.info("""cache_operation:
   action: clear
   status: success""")
+        with self._scans_lock:
+            self._scans.clear()
 
     def _list_cache(self) -> str:
         """List cached request hashes with prompt segments.
         
         Returns most recent 64 entries, sorted by date (newest first).
         """
+        return self._cached_scan("list", self._scan_cache_list)
+
+    def _scan_cache_list(self) -> str:
+        """Render the listing of the most recent cache files."""
         result = []
         cache_dir = get_cache_dir()
         if cache_dir.exists():
-            # Get all cache files with their timestamps
-            files_with_time = []
-            for file in cache_dir.glob("*.json"):
-                try:
-                    ctime = file.stat().st_ctime
-                    files_with_time.append((file, ctime))
-                except Exception as e:
-                    logger.error(f"""cache_operation:
-  action: get_stats
-  status: error
-  file: {file}
-  error: {str(e)}""")
-                    continue
+            # Take the 64 newest cache files; a bounded heap avoids sorting
+            # the whole directory to find them
+            sorted_files = heapq.nlargest(64, self._entries_with_ctime(), key=lambda x: x[1])
             
-            # Sort by timestamp (newest first) and take top 64
-            sorted_files = [f[0] for f in sorted(files_with_time, key=lambda x: x[1], reverse=True)][:64]
-            
-            # Process files
-            for file in sorted_files:
+            # Read the files concurrently so their I/O latency overlaps, then
+            # render them in order, reusing the creation times from the scan
+            if sorted_files:
+                with ThreadPoolExecutor(max_workers=min(_LIST_READ_WORKERS, len(sorted_files))) as executor:
+                    contents = list(executor.map(_read_list_entry,
+                                                 [entry.path for entry, _ in sorted_files],
+                                                 [entry.stat().st_size for entry, _ in sorted_files]))
+            else:
+                contents = []
+            for (entry, ctime), (summary, raw, read_error) in zip(sorted_files, contents):
+                file = Path(entry.path)
                 try:
                     # Get hash from filename
                     hash = file.stem.split('_', 1)[0] if '_' in file.stem else file.stem[:8]
                     
-                    # Get file creation time
-                    ctime = file.stat().st_ctime
                     timestamp = datetime.fromtimestamp(ctime).strftime('%H:%M:%S')
                     
-                    # Read and parse JSON
-                    with file.open('r') as f:
-                        try:
-                            data = json.load(f)
-                        except json.JSONDecodeError:
-                            # Try reading with added braces
-                            f.seek(0)
-                            content = "{" + f.read() + "}"
-                            data = json.loads(content)
+                    if summary is not None:
+                        result.append(f"{hash:<8}  {timestamp}  {summary}\n")
+                        continue
+                    
+                    # Entries written without a summary are parsed instead
+                    if read_error is not None:
+                        raise read_error
+                    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
                     if isinstance(data, dict) and "request" in data:
-                        request = data.get("request", {})
-                        response = data.get("response", "")
-                        
-                        # Get key metadata
-                        req_type = request.get("type", "unknown")
-                        path = request.get("path", "")
-                        prompt = request.get("prompt", "")
-                        model = request.get("model", "gpt-4")  # Use gpt-4 as default to match test expectations
-                        
-                        # Calculate sizes
-                        req_size = len(json.dumps(request).encode())
-                        resp_size = len(json.dumps(response).encode())
-                        
-                        # Format display text
-                        if req_type == "filesystem":
-                            display_text = f"fs:{prompt[:30]}" if prompt else path
-                        elif req_type == "file_content":
-                            display_text = f"file:{path}"
-                        else:
-                            display_text = f"{req_type}:{path or prompt}"
-                            
-                        if len(display_text) > 40:
-                            display_text = display_text[:37] + "..."
-                            
-                        # Add entry with debug info
-                        result.append(
-                            f"{hash:<8}  {timestamp}  {display_text:<40}  "
-                            f"req:{req_size:<6} resp:{resp_size:<6}  "
-                            f"{model}\n"  # Model will already have default if not present
-                        )
+                        # Measured as cache_response measures it when storing a summary
+                        resp_size = len(json.dumps(data.get("response", "")))
+                        summary = summarize_cache_entry(data.get("request", {}), resp_size)
+                        result.append(f"{hash:<8}  {timestamp}  {summary}\n")
                     else:
                         # For legacy or invalid files, use file size
-                        size = file.stat().st_size
+                        size = entry.stat().st_size
                         size_str = f"{size:,d}"
                         result.append(f"{hash}  {timestamp}  {'<invalid>':<40}  {size_str:>10} bytes\n")
                 except Exception as e:
@@ -159,8 +284,7 @@ class CacheControlPlugin(MultiProcPlugin):
   status: error
   file: {file}
   error: {str(e)}""")
-                    # Get file creation time even for error cases
-                    ctime = file.stat().st_ctime
+                    # Show the creation time even for error cases
                     timestamp = datetime.fromtimestamp(ctime).strftime('%H:%M:%S')
                     result.append(f"{hash}  {timestamp}  {'<error>':<40}  {'0':>10} bytes\n")
         return "".join(result) if result else "Cache empty\n"
@@ -168,58 +292,63 @@ class CacheControlPlugin(MultiProcPlugin):
     def generate(self, path: str, node: FileNode, fs_structure: Dict[str, FileNode]) -> str:
         """Handle reads/writes to cache control files."""
         # Strip /.touchfs/ prefix to get proc path
-        proc_path = path.replace("/.touchfs/", "")
+        proc_path = path[len("/.touchfs/"):] if path.startswith("/.touchfs/") else path
         
         # Ensure node has proper attributes for proc files
         if "attrs" not in node:
             node.attrs = {}
         node.attrs["st_mode"] = "33188"  # Regular file with 644 permissions
         
-        if proc_path == "cache_enabled":
-            if node.content:
-                try:
-                    value = node.content.strip()
-                    if value == "1":
-                        config.features.set_cache_enabled(True)
-                        logger.info("""cache_control:
+        handler = self._handlers.get(proc_path)
+        return handler(node) if handler else ""
+
+    def _handle_enabled(self, node: FileNode) -> str:
+        """Apply a 0/1 written to cache_enabled and report the current state."""
+        if node.content:
+            try:
+                value = node.content.strip()
+                if value == "1":
+                    config.features.set_cache_enabled(True)
+                    logger.info("""cache_control:
   action: set_enabled
   status: success
   value: enabled""")
-                    elif value == "0":
-                        config.features.set_cache_enabled(False)
-                        logger.info("""cache_control:
+                elif value == "0":
+                    config.features.set_cache_enabled(False)
+                    logger.info("""cache_control:
   action: set_enabled
   status: success
   value: disabled""")
-                    else:
-                        logger.warning(f"""cache_control:
+                else:
+                    logger.warning(f"""cache_control:
   action: set_enabled
   status: error
   value: {value}
   error: invalid_value""")
-                except Exception as e:
-                    logger.error(f"""cache_control:
+            except Exception as e:
+                logger.error(f"""cache_control:
   action: set_enabled
   status: error
   error: {str(e)}""")
-            return "1\n" if config.features.get_cache_enabled() else "0\n"
-
-        elif proc_path == "cache_stats":
-            stats = cache_stats.get_stats()
-            cache_size = self._get_cache_size()
-            return (
-                f"Hits: {stats['hits']}\n"
-                f"Misses: {stats['misses']}\n"
-                f"Size: {cache_size} bytes\n"
-                f"Enabled: {config.features.get_cache_enabled()}\n"
-            )
-
-        elif proc_path == "cache_clear":
-            if node.content and node.content.strip() == "1":
-                self._clear_cache()
-            return "Write 1 to clear cache\n"
-
-        elif proc_path == "cache_list":
-            return self._list_cache()
-
-        return ""
+        return "1\n" if config.features.get_cache_enabled() else "0\n"
+
+    def _handle_stats(self, node: FileNode) -> str:
+        """Report cache hits, misses, size and state."""
+        stats = cache_stats.get_stats()
+        cache_size = self._get_cache_size()
+        return (
+            f"Hits: {stats['hits']}\n"
+            f"Misses: {stats['misses']}\n"
+            f"Size: {cache_size} bytes\n"
+            f"Enabled: {config.features.get_cache_enabled()}\n"
+        )
+
+    def _handle_clear(self, node: FileNode) -> str:
+        """Clear the cache when 1 was written to cache_clear."""
+        if node.content and node.content.strip() == "1":
+            self._clear_cache()
+        return "Write 1 to clear cache\n"
+
+    def _handle_list(self, node: FileNode) -> str:
+        """List the most recent cache entries."""
+        return self._list_cache()
@@ -2,20 +2,30 @@
 import os
 import json
 import logging
-from typing import Dict, Optional
+import functools
+from typing import Dict, Optional, Tuple
 from openai import OpenAI
 from ...models.filesystem import FileNode, GeneratedContent
-from ...config.logger import setup_logging
 from ... import config
 from ...core.context.context import ContextBuilder, build_context
+from ..client import get_openai_client
 from .base import BaseContentGenerator
 
-def get_openai_client() -> OpenAI:
-    """Initialize OpenAI client with API key from environment."""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY environment variable is required")
-    return OpenAI()
+@functools.lru_cache(maxsize=32)
+def _prompt_segments(system_prompt: str) -> Tuple[str, ...]:
+    """Split a system prompt around its {CONTEXT} placeholders.
+    
+    The prompt for a directory only changes when its prompt file does, so it
+    is split once and each generation just joins the segments with the new
+    context instead of searching the whole prompt again.
+    
+    Args:
+        system_prompt: System prompt possibly containing {CONTEXT}
+        
+    Returns:
+        Literal prompt segments to join with the context string
+    """
+    return tuple(system_prompt.split("{CONTEXT}"))
 
 class DefaultGenerator(BaseContentGenerator):
     """Default generator that uses OpenAI to generate file content."""
@@ -134,7 +144,8 @@ class DefaultGenerator(BaseContentGenerator):
             # Scan underlying filesystem if available
             if overlay_path:
                 from ...core.context.context import scan_overlay
-                logger.debug(f"""scanning_overlay:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"""scanning_overlay:
   path: {overlay_path}
   contents: {os.listdir(overlay_path)}""")
                 scan_overlay(overlay_path, builder, logger)
@@ -143,35 +154,39 @@ class DefaultGenerator(BaseContentGenerator):
             context_str = builder.build()
             
             # Replace {CONTEXT} in system prompt with structured context
-            final_prompt = system_prompt.replace("{CONTEXT}", context_str)
+            final_prompt = context_str.join(_prompt_segments(system_prompt))
             
             # Store the final prompt for debugging
             config.prompts.set_last_final_prompt(final_prompt)
             
-            # Construct messages
+            # Construct messages. Only the path differs between files, so it is
+            # sent last: requests then share the prompt prefix, which the API
+            # can serve from its prompt cache
             messages = [
                 {"role": "system", "content": final_prompt},
                 {"role": "user", "content": f"Generate content for {path}"}
             ]
             
-            # Log complete prompt metadata and messages in YAML format
-            metadata_yaml = f"""prompt_metadata:
+            # Log complete prompt metadata and messages in YAML format; the
+            # message dump includes the whole context, so only build it when it is shown
+            if logger.isEnabledFor(logging.DEBUG):
+                metadata_yaml = f"""prompt_metadata:
   type: chat_completion
   model: {model}
   temperature: 0.2
   num_messages: {len(messages)}
   response_format: GeneratedContent
   target_file: {path}"""
-            logger.debug(metadata_yaml)
+                logger.debug(metadata_yaml)
             
-            # Format messages as YAML
-            messages_yaml = "messages:"
-            for msg in messages:
-                messages_yaml += f"\n  - role: {msg['role']}\n    content: |\n"
-                # Indent content lines for YAML block scalar
-                content_lines = msg['content'].split('\n')
-                messages_yaml += '\n'.join(f"      {line}" for line in content_lines)
-            logger.debug(messages_yaml)
+                # Format messages as YAML
+                messages_yaml = "messages:"
+                for msg in messages:
+                    messages_yaml += f"\n  - role: {msg['role']}\n    content: |\n"
+                    # Indent content lines for YAML block scalar
+                    content_lines = msg['content'].split('\n')
+                    messages_yaml += '\n'.join(f"      {line}" for line in content_lines)
+                logger.debug(messages_yaml)
             
             try:
                 completion = client.beta.chat.completions.parse(
@@ -34,7 +34,6 @@ class MultiProcPlugin(BaseContentGenerator):
         Check if this generator should handle the given file.
         Returns True for files matching any of the proc paths in .touchfs directory.
         """
-        for proc_path in self.get_proc_paths():
-            if path == f"/.touchfs/{proc_path}":
-                return True
-        return False
+        # Registry dispatch asks every plugin in turn, so reject paths outside
+        # .touchfs before building anything
+        return path.startswith("/.touchfs/") and path[len("/.touchfs/"):] in self.get_proc_paths()
@@ -32,5 +32,6 @@ class ProcPlugin(BaseContentGenerator):
         Check if this generator should handle the given file.
         Returns True for files matching the proc path in .touchfs directory.
         """
-        expected_path = f"/.touchfs/{self.get_proc_path()}"
-        return path == expected_path
+        # Registry dispatch asks every plugin in turn, so reject paths outside
+        # .touchfs before building anything
+        return path.startswith("/.touchfs/") and path[len("/.touchfs/"):] == self.get_proc_path()
@@ -24,7 +24,7 @@ class PromptPlugin(MultiProcPlugin):
     def generate(self, path: str, node: FileNode, fs_structure: Dict[str, FileNode]) -> str:
         """Return the requested prompt information based on path."""
         # Strip /.touchfs/ prefix to get proc path
-        proc_path = path.replace("/.touchfs/", "")
+        proc_path = path[len("/.touchfs/"):] if path.startswith("/.touchfs/") else path
         
         # Ensure node has proper attributes for proc files
         if "attrs" not in node:
@@ -1,6 +1,8 @@
 """README generator that creates filesystem tree documentation with ANSI colors."""
-from typing import Dict, List, Union
+import os
+from typing import Dict, List, Optional, Union
 from ...models.filesystem import FileNode
+from ...config.settings import find_nearest_prompt_file
 from .proc import ProcPlugin
 
 # ANSI color codes
@@ -23,6 +25,8 @@ FILE_INFO = f"{MAGENTA}"
 class ReadmeGenerator(ProcPlugin):
     """Generator that creates README in .touchfs directory with filesystem tree structure."""
     
+    needs_full_context = True
+    
     def generator_name(self) -> str:
         return "readme"
     
@@ -42,6 +46,8 @@ class ReadmeGenerator(ProcPlugin):
         node = structure[path]
         children = self._get_node_attr(node, 'children', {})
         sorted_names = sorted(children.keys())
+        # Nearest prompt file per directory, shared by the files listed in it
+        nearest_prompts: Dict[str, Optional[str]] = {}
         
         for i, name in enumerate(sorted_names):
             child_path = children[name]
@@ -64,8 +70,10 @@ class ReadmeGenerator(ProcPlugin):
                     line += f"{FILE_INFO}[Auto-generated by {xattrs['generator']} plugin]{RESET}"
                 else:
                     # Find nearest prompt file using settings function
-                    from ...config.settings import find_nearest_prompt_file
-                    prompt_path = find_nearest_prompt_file(child_path, structure)
+                    child_dir = os.path.dirname(child_path)
+                    if child_dir not in nearest_prompts:
+                        nearest_prompts[child_dir] = find_nearest_prompt_file(child_path, structure)
+                    prompt_path = nearest_prompts[child_dir]
                     prompt_info = f", using {prompt_path[1:]}" if prompt_path else ""
                     line += f"{FILE_INFO}[Generated on first read{prompt_info}]{RESET}"
                 
@@ -1,7 +1,7 @@
 """Tree generator that creates a structured, greppable filesystem tree visualization."""
 import os
 from typing import Any, Dict, List, Optional, Tuple
-from ...models.filesystem import FileNode, FileAttrs
+from ...models.filesystem import FileNode, FileAttrs, copy_xattrs
 from .proc import ProcPlugin
 from ...config.settings import find_nearest_prompt_file, find_nearest_model_file
 
@@ -26,6 +26,8 @@ def get_prompt_excerpt(content: str, width: int) -> str:
 class TreeGenerator(ProcPlugin):
     """Generator that creates a structured tree visualization in .touchfs directory."""
     
+    needs_full_context = True
+    
     def generator_name(self) -> str:
         return "tree"
     
@@ -42,13 +44,15 @@ class TreeGenerator(ProcPlugin):
         if not attrs:
             attrs = {"st_mode": "33188"}  # Default to regular file with 644 permissions
             
-        # Create FileNode with all optional fields
-        return FileNode(
+        # Create FileNode with all optional fields. The tree only reads nodes the
+        # filesystem already holds, so skip re-running the validators for each one;
+        # xattrs are still decoded to str as validation would.
+        return FileNode.model_construct(
             type=node.get("type", "file"),
             content=node.get("content", ""),
             children=node.get("children"),  # Keep children if present
-            attrs=FileAttrs(**attrs),
-            xattrs=node.get("xattrs", {})
+            attrs=FileAttrs.model_construct(**attrs),
+            xattrs=copy_xattrs(node.get("xattrs", {}))
         )
 
     def _calculate_dimensions(self, path: str, structure: Dict[str, Any], indent: str = "") -> Tuple[int, int]:
@@ -126,6 +130,10 @@ class TreeGenerator(ProcPlugin):
             names = list(children.keys())
             child_paths = [children[name] for name in names]
         
+        # The nearest prompt/model files only depend on a file's directory, so
+        # they are looked up once for all the files generated in it
+        nearest_files: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        
         for i, name in enumerate(names):
             child_path = child_paths[i]
             child_node = self._convert_to_filenode(structure[child_path])
@@ -166,8 +174,13 @@ class TreeGenerator(ProcPlugin):
                         
                         # For default generator, show prompt and model info more concisely
                         if generator == "default":
-                            prompt_path = find_nearest_prompt_file(child_path, structure)
-                            model_path = find_nearest_model_file(child_path, structure)
+                            child_dir = os.path.dirname(child_path)
+                            if child_dir not in nearest_files:
+                                nearest_files[child_dir] = (
+                                    find_nearest_prompt_file(child_path, structure),
+                                    find_nearest_model_file(child_path, structure)
+                                )
+                            prompt_path, model_path = nearest_files[child_dir]
                             
                             # Show relative paths more concisely
                             rel_prompt = os.path.basename(prompt_path) if prompt_path else "prompt.default"
@@ -1,5 +1,12 @@
 """Core filesystem operations and data structures."""
 from .jsonfs import JsonFS
-from .memory import Memory      # Import from the new subpackage
 
 __all__ = ["Memory", "JsonFS"]
+
+def __getattr__(name):
+    """Import Memory (and with it fusepy) only when it is actually used."""
+    if name == "Memory":
+        from .memory import Memory      # Import from the new subpackage
+        globals()[name] = Memory
+        return Memory
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
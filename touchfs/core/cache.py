@@ -2,18 +2,35 @@
 import os
 import json
 import hashlib
+import tempfile
 import base64
 import logging
+import functools
+import threading
+import contextlib
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from . import cache_stats
 from ..config.settings import get_cache_enabled
 
+try:
+    import orjson
+except ImportError:  # Optional: cache files are read and written with the standard library
+    orjson = None
+
 logger = logging.getLogger("touchfs")
 
 # Initialize cache system logging
 logger.info("Initializing TouchFS cache system")
 
+# Locks for requests currently being generated, keyed by cache filename, with
+# the number of threads holding or waiting on each
+_request_locks: Dict[Tuple[str, str], List] = {}
+_request_locks_guard = threading.Lock()
+
+# Suffix of the file next to each cache entry that holds its cache_list columns
+SUMMARY_SUFFIX = ".meta"
+
 def get_cache_dir() -> Path:
     """Get the cache directory path.
     
@@ -22,7 +39,16 @@ def get_cache_dir() -> Path:
     Returns:
         Path to cache directory
     """
-    cache_dir = os.getenv("TOUCHFS_CACHE_FOLDER")
+    return _resolve_cache_dir(os.getenv("TOUCHFS_CACHE_FOLDER"))
+
+@functools.lru_cache(maxsize=8)
+def _resolve_cache_dir(cache_dir: Optional[str]) -> Path:
+    """Build the cache directory path for a TOUCHFS_CACHE_FOLDER value.
+    
+    Every cache lookup and store resolves the directory, so the Path (and the
+    home directory lookup for the default) is built once per distinct value of
+    the environment variable instead of on each call.
+    """
     if cache_dir:
         logger.debug(f"Using custom cache directory from TOUCHFS_CACHE_FOLDER: {cache_dir}")
         return Path(cache_dir)
@@ -39,22 +65,88 @@ def compute_cache_filename(request_data: Dict[str, Any]) -> Tuple[str, str]:
     Returns:
         Tuple of (8-byte hash, 40-byte base64 path-safe prompt)
     """
-    # Sort dictionary to ensure consistent hashing
-    serialized = json.dumps(request_data, sort_keys=True)
-    full_hash = hashlib.sha256(serialized.encode()).hexdigest()
+    # Sort dictionary to ensure consistent hashing. The serialization stays on
+    # the json module so existing cache entries keep their filenames.
+    serialized = json.dumps(request_data, sort_keys=True).encode()
+    full_hash = hashlib.sha256(serialized).hexdigest()
     hash_prefix = full_hash[:8]  # First 8 bytes
     
-    # Get content to encode in filename - use entire request for uniqueness
-    content = json.dumps(request_data, sort_keys=True)
-    
-    # Use URL-safe base64 encoding and take first 40 bytes
-    safe_prompt = base64.urlsafe_b64encode(content.encode()).decode()[:40]
+    # Encode the same serialized request in the filename for uniqueness;
+    # only the first 30 bytes are needed for 40 base64 characters
+    safe_prompt = base64.urlsafe_b64encode(serialized[:30]).decode()
     # Pad with - if shorter than 40 bytes
     safe_prompt = safe_prompt.ljust(40, '-')
     
     logger.debug(f"Generated cache filename components - Hash: {hash_prefix}, Safe prompt: {safe_prompt}")
     return hash_prefix, safe_prompt
 
+@contextlib.contextmanager
+def request_lock(request_data: Optional[Dict[str, Any]]) -> Iterator[Optional[Tuple[str, str]]]:
+    """Serialize work on identical cache requests.
+    
+    FUSE dispatches calls on several threads, so parallel reads of one file
+    can miss the cache together and each generate the same content. Holding
+    this lock around the cache lookup, generation and store makes later
+    callers wait for the first one and then hit its cache entry. Requests
+    with different keys never block each other.
+    
+    Args:
+        request_data: Dictionary containing request parameters, or None to
+            skip locking for uncached requests
+        
+    Yields:
+        The request's cache filename components, to pass on as cache_key to
+        get_cached_response and cache_response, or None for uncached requests
+    """
+    if request_data is None:
+        yield None
+        return
+    key = compute_cache_filename(request_data)
+    with _request_locks_guard:
+        entry = _request_locks.get(key)
+        if entry is None:
+            entry = _request_locks[key] = [threading.Lock(), 0]
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield key
+    finally:
+        with _request_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _request_locks[key]
+
+def summarize_cache_entry(request: Dict[str, Any], response_size: int) -> str:
+    """Format the cache_list columns describing a cache entry.
+    
+    Args:
+        request: Request parameters as stored in the cache file
+        response_size: Size of the response in bytes
+        
+    Returns:
+        Display text, request and response sizes, and model of the entry
+    """
+    req_type = request.get("type", "unknown")
+    path = request.get("path", "")
+    prompt = request.get("prompt", "")
+    model = request.get("model", "gpt-4")  # Use gpt-4 as default to match test expectations
+    
+    # Requests are a few short fields, so encoding one to measure it is cheap
+    req_size = len(json.dumps(request).encode())
+    
+    # Format display text
+    if req_type == "filesystem":
+        display_text = f"fs:{prompt[:30]}" if prompt else path
+    elif req_type == "file_content":
+        display_text = f"file:{path}"
+    else:
+        display_text = f"{req_type}:{path or prompt}"
+        
+    if len(display_text) > 40:
+        display_text = display_text[:37] + "..."
+        
+    return f"{display_text:<40}  req:{req_size:<6} resp:{response_size:<6}  {model}"
+
 def _decode_from_json(data: Any) -> Any:
     """Decode data from JSON, handling binary content.
     
@@ -72,11 +164,14 @@ def _decode_from_json(data: Any) -> Any:
         return [_decode_from_json(item) for item in data]
     return data
 
-def get_cached_response(request_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+def get_cached_response(request_data: Dict[str, Any],
+                        cache_key: Optional[Tuple[str, str]] = None) -> Optional[Dict[str, Any]]:
     """Get cached response for a request if available.
     
     Args:
         request_data: Dictionary containing request parameters
+        cache_key: Filename components from compute_cache_filename, if the
+            caller already has them; saves serializing and hashing the request again
         
     Returns:
         Cached response if available, None otherwise
@@ -90,28 +185,28 @@ def get_cached_response(request_data: Dict[str, Any]) -> Optional[Dict[str, Any]
         return None
         
     cache_dir = get_cache_dir()
-    if not cache_dir.exists():
-        logger.warning(f"Cache directory does not exist: {cache_dir}")
-        cache_stats.increment_misses()
-        return None
-        
-    hash_prefix, safe_prompt = compute_cache_filename(request_data)
+    hash_prefix, safe_prompt = cache_key or compute_cache_filename(request_data)
     cache_file = cache_dir / f"{hash_prefix}_{safe_prompt}.json"
     
-    if not cache_file.exists():
-        logger.debug(f"Cache miss - File not found: {cache_file.name}")
-        cache_stats.increment_misses()
-        return None
-        
     try:
         logger.debug(f"Reading cache file: {cache_file.name}")
-        with cache_file.open('r') as f:
-            cache_data = json.load(f)
-            cache_stats.increment_hits()
-            logger.info(f"Cache hit for {request_type} request - File: {cache_file.name}")
-            response = cache_data.get("response") if isinstance(cache_data, dict) else cache_data
-            return _decode_from_json(response)
-    except json.JSONDecodeError as e:
+        # Open directly rather than checking the directory and file first,
+        # so a lookup costs a single system call whether it hits or misses
+        with cache_file.open('rb') as f:
+            raw = f.read()
+        cache_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        cache_stats.increment_hits()
+        logger.info(f"Cache hit for {request_type} request - File: {cache_file.name}")
+        response = cache_data.get("response") if isinstance(cache_data, dict) else cache_data
+        return _decode_from_json(response)
+    except FileNotFoundError:
+        if cache_dir.exists():
+            logger.debug(f"Cache miss - File not found: {cache_file.name}")
+        else:
+            logger.warning(f"Cache directory does not exist: {cache_dir}")
+        cache_stats.increment_misses()
+        return None
+    except ValueError as e:  # json.JSONDecodeError and orjson.JSONDecodeError
         logger.error(f"Failed to parse cache file {cache_file.name}: {e}")
         cache_stats.increment_misses()
         return None
@@ -140,12 +235,15 @@ def _prepare_for_json(data: Any) -> Any:
         return [_prepare_for_json(item) for item in data]
     return data
 
-def cache_response(request_data: Dict[str, Any], response_data: Dict[str, Any]):
+def cache_response(request_data: Dict[str, Any], response_data: Dict[str, Any],
+                   cache_key: Optional[Tuple[str, str]] = None):
     """Cache a response for a request.
     
     Args:
         request_data: Dictionary containing request parameters
         response_data: Dictionary containing response data
+        cache_key: Filename components from compute_cache_filename, if the
+            caller already has them
     """
     request_type = request_data.get("type", "unknown")
     logger.debug(f"Attempting to cache response for request type: {request_type}")
@@ -168,7 +266,7 @@ def cache_response(request_data: Dict[str, Any], response_data: Dict[str, Any]):
         logger.error(f"Failed to create cache directory {cache_dir}: {str(e)}", exc_info=True)
         return
     
-    hash_prefix, safe_prompt = compute_cache_filename(request_data)
+    hash_prefix, safe_prompt = cache_key or compute_cache_filename(request_data)
     cache_file = cache_dir / f"{hash_prefix}_{safe_prompt}.json"
     
     try:
@@ -176,11 +274,52 @@ def cache_response(request_data: Dict[str, Any], response_data: Dict[str, Any]):
             "request": _prepare_for_json(request_data),
             "response": _prepare_for_json(response_data)
         }
+        # Encode up front: orjson (when installed) or json.dumps, which unlike
+        # json.dump hands the file one buffer instead of many small writes
+        payload = None
+        if orjson is not None:
+            try:
+                payload = orjson.dumps(cache_data, option=orjson.OPT_INDENT_2)
+            except TypeError:  # Values orjson can't encode get the json module's handling
+                pass
+        if payload is None:
+            payload = json.dumps(cache_data, indent=2).encode()
+        # Store the entry's cache_list columns next to it, so listing the
+        # cache doesn't have to parse every entry. It is written first so the
+        # entry never appears without it. The response is measured as compact
+        # JSON, which json.dumps keeps ASCII, so its length is the byte size.
+        response_size = len(json.dumps(cache_data["response"]))
+        summary = summarize_cache_entry(cache_data["request"], response_size)
+        try:
+            _write_file_atomic(cache_file.with_suffix(SUMMARY_SUFFIX), f"{summary}\n".encode(), sync=False)
+        except Exception as e:
+            logger.warning(f"Failed to write cache summary for {cache_file.name}: {str(e)}")
         logger.debug(f"Writing cache file: {cache_file.name}")
-        with cache_file.open('w') as f:
-            json.dump(cache_data, f, indent=2)
-            f.flush()  # Ensure data is written to disk
-            os.fsync(f.fileno())  # Force flush to disk
-            logger.info(f"Successfully cached {request_type} response to: {cache_file.name}")
+        _write_file_atomic(cache_file, payload)
+        logger.info(f"Successfully cached {request_type} response to: {cache_file.name}")
     except Exception as e:
         logger.error(f"Failed to write cache file {cache_file.name}: {str(e)}", exc_info=True)
+
+def _write_file_atomic(path: Path, payload: bytes, sync: bool = True):
+    """Write a file through a temporary file renamed into place.
+    
+    A mount and a generate command sharing the cache then never read a
+    half-written file.
+    
+    Args:
+        path: File to write
+        payload: Contents to write
+        sync: Whether to flush the contents to disk before the rename
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem[:8]}_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            if sync:
+                f.flush()  # Ensure data is written to disk
+                os.fsync(f.fileno())  # Force flush to disk
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
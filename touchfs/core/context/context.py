@@ -8,17 +8,21 @@ This module provides functionality to build context for LLM content generation b
 """
 
 import os
+import re
 import sys
 import json
 import base64
 import logging
 from pathlib import Path
-import tiktoken
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Any, Union
 from ...config import settings
 
 logger = logging.getLogger("touchfs")
 
+# Number of files read concurrently while building context
+CONTEXT_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 class ContextBuilder:
     """Builds structured context for content generation following MCP principles.
     
@@ -35,6 +39,7 @@ class ContextBuilder:
         Args:
             max_tokens: Maximum number of tokens to include in context
         """
+        import tiktoken  # Deferred: only needed once context is actually built
         self.max_tokens = max_tokens or settings.DEFAULT_MAX_TOKENS
         self.encoding = tiktoken.get_encoding("cl100k_base")  # GPT-4 encoding
         self.current_tokens = 0
@@ -68,10 +73,16 @@ class ContextBuilder:
             
         return False
 
-    def would_exceed_token_limit(self, text: str) -> bool:
-        """Check if adding text would exceed token limit."""
+    def would_exceed_token_limit(self, text: str, token_count: Optional[int] = None) -> bool:
+        """Check if adding text would exceed token limit.
+        
+        Args:
+            text: Text that would be added
+            token_count: Token count of text if the caller already computed it
+        """
         try:
-            token_count = self.count_tokens(text)
+            if token_count is None:
+                token_count = self.count_tokens(text)
             if token_count is None:
                 logger.debug("Could not count tokens, assuming limit would be exceeded")
                 self.failed_attempts += 1
@@ -126,8 +137,10 @@ class ContextBuilder:
             formatted_content = f"# File: {path}\nType: {path_obj.suffix[1:] if path_obj.suffix else 'unknown'}\n"
             formatted_content += "```\n" + content_str.rstrip() + "\n```\n"
 
-            # Check token limit before adding
-            if self.would_exceed_token_limit(formatted_content):
+            # Check token limit before adding. The count is reused below, so the
+            # content is only tokenized once.
+            token_count = self.count_tokens(formatted_content)
+            if self.would_exceed_token_limit(formatted_content, token_count):
                 logger.debug(f"Skipping {path}: would exceed token limit")
                 return False
 
@@ -148,7 +161,6 @@ class ContextBuilder:
             
             # Add to context parts and update token count
             self.context_parts.append(resource)
-            token_count = self.count_tokens(formatted_content)
             if token_count:
                 self.current_tokens += token_count
             logger.debug(f"Added {path} to context")
@@ -290,6 +302,87 @@ def _sort_path_key(path: str) -> tuple:
         # Return a fallback sort key with consistent types
         return (999, 0, ('',), 999, str(path))
 
+def _translate_path_component(component: str) -> str:
+    """Translate one glob path component into a regex that stays within it."""
+    i, n = 0, len(component)
+    parts = []
+    while i < n:
+        c = component[i]
+        i += 1
+        if c == '*':
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            j = i
+            if j < n and component[j] == '!':
+                j += 1
+            if j < n and component[j] == ']':
+                j += 1
+            while j < n and component[j] != ']':
+                j += 1
+            if j >= n:
+                parts.append('\\[')
+            else:
+                stuff = component[i:j].replace('\\', '\\\\')
+                i = j + 1
+                if stuff.startswith('!'):
+                    stuff = '^' + stuff[1:]
+                elif stuff.startswith('^'):
+                    stuff = '\\' + stuff
+                parts.append(f'[{stuff}]')
+        else:
+            parts.append(re.escape(c))
+    return ''.join(parts)
+
+def _compile_path_patterns(patterns: List[str]) -> Optional["re.Pattern[str]"]:
+    """Compile glob patterns into a single regex with Path.match semantics.
+    
+    Like Path.match, relative patterns are matched from the right on whole path
+    components and wildcards never cross a '/'. Matching one alternation per
+    path replaces constructing a Path and globbing it once per pattern.
+    
+    Args:
+        patterns: Glob patterns to combine
+        
+    Returns:
+        Compiled pattern to use with search(), or None if there are no patterns
+    """
+    alternatives = []
+    for pattern in patterns:
+        anchor = '^/' if pattern.startswith('/') else '(?:^|/)'
+        components = [c for c in pattern.split('/') if c]
+        if not components:
+            continue
+        alternatives.append(anchor + '/'.join(_translate_path_component(c) for c in components) + '$')
+    if not alternatives:
+        return None
+    return re.compile('|'.join(f'(?:{a})' for a in alternatives))
+
+def _read_context_file(file_path: str) -> Optional[Union[str, bytes]]:
+    """Read a file for context building.
+    
+    Args:
+        file_path: Absolute path of the file to read
+        
+    Returns:
+        File content as text, or as bytes if it isn't valid UTF-8; None if unreadable
+    """
+    try:
+        # First try to read as text
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except UnicodeDecodeError:
+        # If that fails, read as binary
+        try:
+            with open(file_path, 'rb') as f:
+                return f.read()
+        except IOError as e:
+            logger.debug(f"Failed to read {file_path}: {e}")
+    except IOError as e:
+        logger.debug(f"Failed to read {file_path}: {e}")
+    return None
+
 def build_context(directory: str, max_tokens: Optional[int] = None,
                  exclude_patterns: Optional[List[str]] = None,
                  include_patterns: Optional[List[str]] = None) -> str:
@@ -298,7 +391,10 @@ def build_context(directory: str, max_tokens: Optional[int] = None,
     Args:
         directory: Root directory to collect context from
         max_tokens: Maximum tokens to include
-        exclude_patterns: List of glob patterns to exclude
+        exclude_patterns: List of glob patterns to exclude. Directories matching
+                         a "dir/*" pattern or named exactly by a pattern without
+                         wildcards are skipped along with everything below them,
+                         as is .git.
         include_patterns: List of glob patterns to include. When specified,
                          only files matching these patterns will be included.
         
@@ -312,25 +408,40 @@ def build_context(directory: str, max_tokens: Optional[int] = None,
     abs_directory = os.path.abspath(directory)
     builder = ContextBuilder(max_tokens)
     
+    # Compile the patterns once instead of globbing every pattern per path
+    dir_excludes = _compile_path_patterns([p.rstrip('/*') for p in exclude_patterns if p.endswith('/*')])
+    file_excludes = _compile_path_patterns([p for p in exclude_patterns if not p.endswith('/*')])
+    includes = _compile_path_patterns(include_patterns) if include_patterns else None
+    # Directories pruned by exact name: git's internals, plus exclude patterns
+    # without wildcards (such as "node_modules"). Wildcard file patterns are
+    # not applied to directories, so '*.git*' still leaves .github/ in.
+    pruned_names = {'.git'} | {p for p in exclude_patterns if not any(c in p for c in '*?[/')}
+    
     # Collect all files
     files = []
-    for root, _, filenames in os.walk(abs_directory):
+    for root, dirnames, filenames in os.walk(abs_directory):
         # Skip excluded directories
-        if any(Path(root).match(pattern.rstrip('/*')) for pattern in exclude_patterns if pattern.endswith('/*')):
+        if dir_excludes and dir_excludes.search(root):
             continue
+        
+        # Prune excluded subdirectories (e.g. .git, node_modules) before os.walk
+        # descends into them, so their contents are never listed at all
+        dirnames[:] = [
+            d for d in dirnames
+            if d not in pruned_names
+            and not (dir_excludes and dir_excludes.search(os.path.join(root, d)))
+        ]
             
         for file in filenames:
             full_path = os.path.join(root, file)
-            rel_path = Path(os.path.relpath(full_path, abs_directory))
             
             # Skip excluded files
-            if any(Path(full_path).match(pattern) for pattern in exclude_patterns if not pattern.endswith('/*')):
+            if file_excludes and file_excludes.search(full_path):
                 continue
             
             # If include patterns are specified, only include matching files
-            if include_patterns:
-                if not any(rel_path.match(pattern) for pattern in include_patterns):
-                    continue
+            if includes and not includes.search(os.path.relpath(full_path, abs_directory)):
+                continue
                 
             files.append(full_path)
     
@@ -364,33 +475,29 @@ def build_context(directory: str, max_tokens: Optional[int] = None,
         logger.debug(f"Files being sorted: {files}")
         raise RuntimeError(f"Failed to sort files: {e}")
     
-            # Add files to context
-    for file_path in files:
-        # Check if we should stop collecting more files
-        if builder.should_stop_collecting():
-            logger.debug("Stopping file collection due to token limit or failed attempts")
-            break
-            
-        # Convert to relative path for context
-        rel_path = os.path.relpath(file_path, abs_directory)
-        
-        try:
-            # First try to read as text
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            # If that fails, read as binary
-            try:
-                with open(file_path, 'rb') as f:
-                    content = f.read()
-            except IOError as e:
-                logger.debug(f"Failed to read {file_path}: {e}")
-                continue
-        except IOError as e:
-            logger.debug(f"Failed to read {file_path}: {e}")
-            continue
+    # Only files with a text extension can be added to the context, so don't read the rest
+    files = [f for f in files if os.path.splitext(f)[1].lower() in settings.DEFAULT_TEXT_EXTENSIONS]
+    
+    # Add files to context. Files are read concurrently one batch at a time so
+    # I/O latency overlaps, while still adding them in sorted order and stopping
+    # early once the token budget is used up.
+    with ThreadPoolExecutor(max_workers=CONTEXT_READ_WORKERS) as executor:
+        for start in range(0, len(files), CONTEXT_READ_WORKERS):
+            # Check if we should stop collecting more files
+            if builder.should_stop_collecting():
+                logger.debug("Stopping file collection due to token limit or failed attempts")
+                break
             
-        if not builder.add_file_content(rel_path, content):
-            continue  # Continue to next file if this one was skipped or hit token limit
+            batch = files[start:start + CONTEXT_READ_WORKERS]
+            for file_path, content in zip(batch, executor.map(_read_context_file, batch)):
+                if builder.should_stop_collecting():
+                    break
+                if content is None:
+                    continue
+                
+                # Convert to relative path for context
+                rel_path = os.path.relpath(file_path, abs_directory)
+                if not builder.add_file_content(rel_path, content):
+                    continue  # Continue to next file if this one was skipped or hit token limit
             
     return builder.build()
@@ -46,7 +46,7 @@ class JsonFS:
                 "attrs": {}
             }
         }
-        self._str = ''
+        self._str = ''  # Cached serialization, '' when stale
 
     def find(self, path: str) -> Optional[Dict[str, Any]]:
         """Find a node in the filesystem by path.
@@ -85,14 +85,19 @@ class JsonFS:
         return []
 
     def update(self):
-        """Re-serialize the entire tree to JSON string and return it."""
-        self._str = json.dumps(self._data, indent=2, cls=FileSystemEncoder)
-        return self._str  # Return for immediate use
+        """Mark the JSON serialization as stale after the tree was modified.
+        
+        The memory filesystem calls this after every write and content
+        generation, while the serialized tree is only needed when the
+        filesystem is converted to a string. Re-serializing the whole tree
+        (file contents included) is therefore deferred to __str__.
+        """
+        self._str = ''
 
     def __str__(self) -> str:
         """Return the JSON string representation of the filesystem."""
-        if not self._str:  # Ensure we have a current serialization
-            self.update()
+        if not self._str:  # Serialize once per modification
+            self._str = json.dumps(self._data, indent=2, cls=FileSystemEncoder)
         return self._str
 
     @property
@@ -10,8 +10,7 @@ from fuse import FuseOSError
 
 from ...content.generator import generate_file_content
 from ..jsonfs import JsonFS
-from ...config.logger import setup_logging
-from ...models.filesystem import FileNode, FileAttrs
+from ...models.filesystem import FileNode, FileAttrs, copy_xattrs
 
 
 class MemoryBase:
@@ -19,12 +18,14 @@ class MemoryBase:
 
     def __init__(self, initial_data: Optional[Dict[str, Any]] = None, mount_point: Optional[str] = None, overlay_path: Optional[str] = None):
         """Initialize the base memory filesystem."""
+        from ...config.env import ensure_env_loaded
+        ensure_env_loaded()
         # Get the existing logger and ensure it's properly initialized for this process
         from ...config.logger import _reinit_logger_after_fork
         _reinit_logger_after_fork()
         self.logger = logging.getLogger("touchfs")
         self.logger.info("Initializing Memory filesystem (base).")
-        self.logger.debug(f"Base initialization in PID: {os.getpid()}")
+        self.logger.debug("Base initialization in PID: %s", os.getpid())
         self.fd = 0
         self._root = JsonFS()
         self._open_files: Dict[int, Dict[str, Any]] = {}
@@ -161,7 +162,7 @@ class MemoryBase:
                 with open(underlying_path, 'r') as f:
                     return f.read()
         except Exception as e:
-            self.logger.debug(f"Could not read underlying file {underlying_path}: {e}")
+            self.logger.debug("Could not read underlying file %s: %s", underlying_path, e)
             
         return None
 
@@ -220,8 +221,10 @@ class MemoryBase:
                 self._root.update()
                 fs_structure = self._root.data
 
-                # Find the path for this node
-                path_for_node = next(path_ for path_, n in fs_structure.items() if n == node)
+                # Find the path for this node. Nodes come from the structure
+                # itself, so compare identity: equality would deep-compare every
+                # node and could match another node with the same contents.
+                path_for_node = next(path_ for path_, n in fs_structure.items() if n is node)
                 
                 # Generate content only if:
                 # 1. File has generate_content xattr or a registered generator
@@ -237,12 +240,14 @@ class MemoryBase:
                 if should_generate:
                     self.logger.info(f"Generating content for size calculation - path: {path_for_node}")
                     
-                    # Convert dict to FileNode for plugin system
-                    file_node = FileNode(
+                    # Convert dict to FileNode for plugin system; the node comes
+                    # from our own structure, so it is built without revalidation.
+                    # Plugins get their own str-valued copy of the xattrs.
+                    file_node = FileNode.model_construct(
                         type=node["type"],
                         content=node.get("content", ""),
-                        attrs=FileAttrs(**node["attrs"]),
-                        xattrs=node.get("xattrs", {})
+                        attrs=FileAttrs.model_construct(**node["attrs"]),
+                        xattrs=copy_xattrs(node.get("xattrs", {}))
                     )
                     
                     # Check for plugin first, regardless of xattrs
@@ -250,31 +255,14 @@ class MemoryBase:
                     
                     if generator:
                         # Use plugin to generate content
-                        self.logger.debug(f"Using plugin {generator.generator_name()} for {path_for_node}")
+                        self.logger.debug("Using plugin %s for %s", generator.generator_name(), path_for_node)
                         content = generator.generate(path_for_node, file_node, fs_structure)
                     else:
-                        # Fallback to default content generation
-                        # Create a deep copy of fs_structure to prevent modifying original
-                        fs_structure_copy = {}
-                        for k, v in fs_structure.items():
-                            if isinstance(v, dict):
-                                node_copy = {}
-                                for nk, nv in v.items():
-                                    if nk == "attrs":
-                                        # Special handling for attrs to match FileSystemEncoder behavior
-                                        attrs_copy = nv.copy()
-                                        for attr in ["st_ctime", "st_mtime", "st_atime", "st_nlink", "st_size"]:
-                                            attrs_copy.pop(attr, None)
-                                        node_copy[nk] = attrs_copy
-                                    elif isinstance(nv, dict):
-                                        node_copy[nk] = nv.copy()
-                                    else:
-                                        node_copy[nk] = nv
-                                fs_structure_copy[k] = node_copy
-                            else:
-                                fs_structure_copy[k] = v
-                        fs_structure_copy['_plugin_registry'] = self._plugin_registry
-                        content = generate_file_content(path_for_node, fs_structure_copy)
+                        # Fallback to default content generation. generate_file_content
+                        # leaves the nodes it is given untouched, so the live
+                        # structure is passed without copying it.
+                        content = generate_file_content(path_for_node, fs_structure,
+                                                        registry=self._plugin_registry)
                     if content:
                         # Update both the copy and original node
                         node["content"] = content
@@ -294,7 +282,7 @@ class MemoryBase:
                         # Ensure changes are persisted
                         self._root._data[path_for_node] = original_node
                         self._root.update()
-                        self.logger.debug(f"Updated content for {path_for_node} (type: {'binary' if isinstance(content, bytes) else 'text'})")
+                        self.logger.debug("Updated content for %s (type: %s)", path_for_node, 'binary' if isinstance(content, bytes) else 'text')
             except Exception as e:
                 self.logger.error(f"Content generation failed during size calculation: {str(e)}")
                 # On failure:
@@ -313,16 +301,16 @@ class MemoryBase:
         content = node.get("content", "")
         if node["type"] == "symlink":
             size = len(content)
-            self.logger.debug(f"Size calculation for symlink: {size} bytes")
+            self.logger.debug("Size calculation for symlink: %s bytes", size)
             return size
         else:  # file
             # Handle binary vs text content
             if isinstance(content, bytes):
                 size = len(content)
-                self.logger.debug(f"Size calculation for binary file: {size} bytes")
+                self.logger.debug("Size calculation for binary file: %s bytes", size)
                 return size
             else:
                 # Regular text content
                 size = len(content.encode('utf-8'))
-                self.logger.debug(f"Size calculation for text file: {size} bytes")
+                self.logger.debug("Size calculation for text file: %s bytes", size)
                 return size
@@ -5,6 +5,7 @@ from errno import ENOENT
 from stat import S_IFDIR
 
 from .base import MemoryBase
+from ...content.generator import forget_file_node
 
 
 class MemoryDirOps:
@@ -18,14 +19,14 @@ class MemoryDirOps:
     def mkdir(self, path: str, mode: int):
         self.logger.info(f"Creating directory: {path} with mode: {mode:o}")
         dirname, basename = self.base._split_path(path)
-        self.logger.debug(f"Split path - dirname: {dirname}, basename: {basename}")
+        self.logger.debug("Split path - dirname: %s, basename: %s", dirname, basename)
 
         parent = self.base[dirname]
         if not parent:
             self.logger.error(f"Parent directory not found for path: {path}")
             raise FuseOSError(ENOENT)
         
-        self.logger.debug(f"Found parent directory: {dirname}")
+        self.logger.debug("Found parent directory: %s", dirname)
         self._root._data[path] = {
             "type": "directory",
             "children": {},
@@ -34,7 +35,7 @@ class MemoryDirOps:
             }
         }
         parent["children"][basename] = path
-        self.logger.debug(f"Successfully created directory {path} in parent {dirname}")
+        self.logger.debug("Successfully created directory %s in parent %s", path, dirname)
 
     def readdir(self, path: str, fh: int) -> list[str]:
         """Read directory contents, merging entries from memory and overlay layers."""
@@ -59,7 +60,7 @@ class MemoryDirOps:
                 except OSError as e:
                     self.logger.error(f"Error reading overlay directory {overlay_path}: {e}")
         
-        self.logger.debug(f"Directory {path} contains {len(entries)-2} entries (excluding . and ..)")
+        self.logger.debug("Directory %s contains %s entries (excluding . and ..)", path, len(entries)-2)
         return list(entries)
 
     def rmdir(self, path: str):
@@ -83,7 +84,8 @@ class MemoryDirOps:
                 parent = self.base[self.base._split_path(path)[0]]
                 parent["children"].pop(self.base._split_path(path)[1])
                 del self._root._data[path]
-                self.logger.debug(f"Successfully removed directory: {path}")
+                forget_file_node(path)
+                self.logger.debug("Successfully removed directory: %s", path)
             except Exception as e:
                 self.logger.error(f"Error removing directory {path}: {str(e)}", exc_info=True)
                 raise
@@ -58,7 +58,7 @@ class MemoryFileOps:
                             # Convert touch_cwd to FUSE path
                             rel_path = os.path.relpath(touch_cwd, mount_point)
                             fuse_dir = "/" + rel_path if rel_path != "." else "/"
-                            self.logger.debug(f"Touch operation in directory: {fuse_dir}")
+                            self.logger.debug("Touch operation in directory: %s", fuse_dir)
                             
                             # Check if directory exists and is actually a directory
                             if fuse_dir != "/":
@@ -69,7 +69,7 @@ class MemoryFileOps:
                             
                             # Update path to preserve directory structure
                             path = os.path.normpath(os.path.join(fuse_dir, os.path.basename(path)))
-                            self.logger.debug(f"Updated path to: {path}")
+                            self.logger.debug("Updated path to: %s", path)
                             break
                     except (psutil.NoSuchProcess, psutil.AccessDenied):
                         continue
@@ -167,7 +167,7 @@ class MemoryFileOps:
                     (not node.get("content") or int(node["attrs"].get("st_size", "0")) == 0)):
                     self.logger.info(f"Generating/fetching content for {path}")
                 else:
-                    self.logger.debug(f"Using existing content (skipping generation) for {path}")
+                    self.logger.debug("Using existing content (skipping generation) for %s", path)
                     self.fd += 1
                     self._open_files[self.fd] = {"path": path, "node": node}
                     return self.fd
@@ -211,7 +211,7 @@ class MemoryFileOps:
                         if not node["xattrs"]:  # Remove empty xattrs dict
                             del node["xattrs"]
                     self._root.update()
-                    self.logger.debug(f"Content stored for {path}, size: {content_size} bytes, type: {'binary' if isinstance(content, bytes) else 'text'}")
+                    self.logger.debug("Content stored for %s, size: %s bytes, type: %s", path, content_size, 'binary' if isinstance(content, bytes) else 'text')
                 else:
                     raise RuntimeError("Content generation/fetch returned empty result")
 
@@ -238,7 +238,7 @@ class MemoryFileOps:
         # Get the node, ensuring content is generated/fetched
         if fh in self._open_files:
             node = self._open_files[fh]["node"]
-            self.logger.debug(f"Using cached file descriptor {fh}")
+            self.logger.debug("Using cached file descriptor %s", fh)
         else:
             # If no file handle, force an open to ensure content is generated/fetched
             self.logger.info(f"No file handle found, opening {path}")
@@ -285,11 +285,11 @@ class MemoryFileOps:
         end_byte = min(offset + size, total_size)
         bytes_to_read = content_bytes[start_byte:end_byte]
         
-        self.logger.debug(f"Reading {len(bytes_to_read)} bytes from {path} (offset: {offset}, requested: {size}, total file size: {total_size})")
+        self.logger.debug("Reading %s bytes from %s (offset: %s, requested: %s, total file size: %s)", len(bytes_to_read), path, offset, size, total_size)
         return bytes_to_read
 
     def write(self, path: str, data: bytes, offset: int, fh: int) -> int:
-        self.logger.debug(f"Write operation started - path: {path}, offset: {offset}")
+        self.logger.debug("Write operation started - path: %s, offset: %s", path, offset)
         
         # Get the node
         if fh in self._open_files:
@@ -387,7 +387,7 @@ class MemoryFileOps:
                 self.logger.info(f"Writing {len(data)} bytes to {path} at offset {offset}")
                 # Log size change appropriately for binary/text content
                 old_size = len(content) if isinstance(content, bytes) else len(content.encode('utf-8'))
-                self.logger.debug(f"File size changed from {old_size} to {new_size} bytes")
+                self.logger.debug("File size changed from %s to %s bytes", old_size, new_size)
                 return len(data)
             except Exception as e:
                 self.logger.error(f"Error writing to file {path}: {str(e)}", exc_info=True)
@@ -420,11 +420,11 @@ class MemoryFileOps:
                     # Truncate to smaller size
                     node["content"] = content[:length]
             node["attrs"]["st_size"] = str(length)
-            self.logger.debug(f"Truncated file {path} from {old_length} to {length} bytes")
+            self.logger.debug("Truncated file %s from %s to %s bytes", path, old_length, length)
 
     def release(self, path: str, fh: int):
         """Clean up when a file is closed."""
-        self.logger.debug(f"Releasing file descriptor {fh} for path: {path}")
+        self.logger.debug("Releasing file descriptor %s for path: %s", fh, path)
         if fh in self._open_files:
             del self._open_files[fh]
         return 0
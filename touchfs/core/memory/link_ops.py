@@ -20,7 +20,7 @@ class MemoryLinkOps:
         node = self.base[path]
         if node:
             target = node.get("content", "")
-            self.logger.debug(f"Symlink {path} points to: {target}")
+            self.logger.debug("Symlink %s points to: %s", path, target)
             return target
         self.logger.warning(f"Attempted to read non-existent symlink: {path}")
         return ""
@@ -28,7 +28,7 @@ class MemoryLinkOps:
     def symlink(self, target: str, source: str):
         self.logger.info(f"Creating symlink: {target} -> {source}")
         dirname, basename = self.base._split_path(target)
-        self.logger.debug(f"Split path - dirname: {dirname}, basename: {basename}")
+        self.logger.debug("Split path - dirname: %s, basename: %s", dirname, basename)
 
         parent = self.base[dirname]
         if not parent:
@@ -43,4 +43,4 @@ class MemoryLinkOps:
             }
         }
         parent["children"][basename] = target
-        self.logger.debug(f"Successfully created symlink {target} pointing to {source}")
+        self.logger.debug("Successfully created symlink %s pointing to %s", target, source)
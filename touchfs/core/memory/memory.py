@@ -30,6 +30,12 @@ class Memory(MemoryBase, Operations):
         self.xattr_ops = MemoryXattrOps(self)
         self.meta_ops = MemoryMetaOps(self)
 
+    def init(self, path):
+        """Called by FUSE once the mount is up, in the serving process."""
+        from ...content.client import reset_openai_client, prewarm_openai_client
+        reset_openai_client()
+        prewarm_openai_client()
+
     # File operations delegation
     def create(self, path, mode):
         return self.file_ops.create(path, mode)
@@ -7,6 +7,7 @@ from errno import ENOENT
 from stat import S_IFDIR, S_IFREG
 
 from .base import MemoryBase
+from ...content.generator import forget_file_node
 
 
 class MemoryMetaOps:
@@ -34,6 +35,7 @@ class MemoryMetaOps:
     def rename(self, old: str, new: str):
         if old in self._root._data:
             node = self._root._data.pop(old)
+            forget_file_node(old)
             old_parent = self.base[os.path.dirname(old)]
             if old_parent and "children" in old_parent:
                 old_parent["children"].pop(os.path.basename(old), None)
@@ -88,11 +90,11 @@ class MemoryMetaOps:
             path: Path to the file
             times: Optional tuple of (atime, mtime) timestamps. If None, uses current time.
         """
-        self.logger.debug(f"utimens called for {path} with times {times}")
+        self.logger.debug("utimens called for %s with times %s", path, times)
         now = int(times[0] if times else time.time())
         node = self.base[path]
         if node:
-            self.logger.debug(f"Found node of type: {node['type']}")
+            self.logger.debug("Found node of type: %s", node['type'])
             # Update timestamps
             atime, mtime = times if times else (now, now)
             node["attrs"]["st_atime"] = str(atime)
@@ -100,13 +102,13 @@ class MemoryMetaOps:
             
             # Mark empty files as touched unless content generation is disabled
             if node["type"] == "file" and not node.get("content"):
-                self.logger.debug(f"Empty file touched: {path}")
+                self.logger.debug("Empty file touched: %s", path)
                 if not os.getenv("TOUCHFS_DISABLE_GENERATION"):
-                    self.logger.debug(f"Marking for content generation")
+                    self.logger.debug("Marking for content generation")
                     if "xattrs" not in node:
                         node["xattrs"] = {}
                     node["xattrs"]["touchfs.generate_content"] = b"true"
-                    self.logger.debug(f"Node marked for content generation")
+                    self.logger.debug("Node marked for content generation")
                 else:
                     self.logger.debug("Content generation disabled, skipping mark")
 
@@ -117,7 +119,8 @@ class MemoryMetaOps:
                 parent = self.base[os.path.dirname(path)]
                 parent["children"].pop(os.path.basename(path), None)
                 del self._root._data[path]
-                self.logger.debug(f"Successfully removed file: {path}")
+                forget_file_node(path)
+                self.logger.debug("Successfully removed file: %s", path)
             except Exception as e:
                 self.logger.error(f"Error removing file {path}: {str(e)}", exc_info=True)
                 raise
@@ -1,5 +1,5 @@
 """Models for filesystem structures and content generation."""
-from typing import Dict, Optional, Literal, Union
+from typing import Any, Dict, Optional, Literal, Union
 from pydantic import BaseModel, Field
 
 class FileAttrs(BaseModel):
@@ -16,6 +16,23 @@ class FileNode(BaseModel):
     attrs: FileAttrs
     xattrs: Optional[Dict[str, str]] = None
 
+def copy_xattrs(xattrs: Optional[Dict[str, Any]]) -> Optional[Dict[str, str]]:
+    """Copy a node's extended attributes the way FileNode validation stores them.
+    
+    The memory filesystem keeps some values as bytes (see setxattr), which
+    validation decodes to str. Nodes built with model_construct use this so
+    plugins get their own str-valued dict instead of the mounted node's.
+    
+    Args:
+        xattrs: Extended attributes from a raw filesystem node
+        
+    Returns:
+        New dict with bytes values decoded, or None if there were none
+    """
+    if xattrs is None:
+        return None
+    return {k: v.decode() if isinstance(v, bytes) else v for k, v in xattrs.items()}
+
 class FileSystem(BaseModel):
     """Complete filesystem structure model."""
     data: Dict[str, FileNode]